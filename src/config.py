@@ -1,4 +1,5 @@
 import os
+import hashlib
 import yaml
 from pathlib import Path
 from dotenv import load_dotenv
@@ -13,7 +14,36 @@ load_dotenv()
 
 SRC = Path(__file__).parent
 PII_COLUMNS = {"first_name", "last_name", "email", "street_address"}
+PII_DIMENSION_CHECK = True      # cross-check result values against the users PII dimension
+PII_DROP_RATIO = 0.5            # drop a column entirely when at least this share of cells is PII
 MAX_RETRIES = 3
+SQL_CANDIDATES = 3              # diverse SQL candidates raced on the first attempt (1 = sequential only)
+MAX_SUB_QUERIES = 4             # planner fan-out limit for analytical "why" questions
+INCREMENTAL_CACHE_SIZE = 128    # trend queries whose closed time buckets are kept in memory
+APPROX_ENABLED = True           # rough sampled preview for trend/share questions while the exact query runs
+APPROX_SAMPLE_PERCENT = 10      # TABLESAMPLE size for the preview
+
+# Local runtime data (report library, caches) - kept out of git
+DATA_DIR = Path(os.getenv("AGENT_DATA_DIR", SRC.parent / ".data"))
+REPORT_FRESHNESS_HOURS = 24     # how long a saved report can answer the same question again
+RESULT_RETENTION = 20           # query results kept on disk per thread (older handles are collected)
+
+# LLM response cache (src/database/llm_cache.py)
+LLM_CACHE_MODE = os.getenv("AGENT_LLM_CACHE", "cache")   # off | cache | record | replay (tests/benchmarks, no network)
+LLM_CACHE_NODES = {"router", "query_planner", "report_writer"}   # nodes whose answers may be reused in "cache" mode
+LLM_CACHE_TTL_HOURS = 24
+LLM_CACHE_SIZE = 5000           # most recently used responses kept
+
+# Golden knowledge learning loop
+GOLDEN_TOP_K = 5                # most similar examples put into the SQL prompt
+GOLDEN_DUPLICATE_THRESHOLD = 0.6  # estimated question Jaccard above which a candidate is a near-duplicate
+GOLDEN_REQUIRE_FEEDBACK = False   # ask the user for a thumbs-up before learning a run
+
+# Multi-session server (src/server.py)
+SERVER_HOST = os.getenv("AGENT_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("AGENT_PORT", "8000"))
+MAX_CONCURRENT_RUNS = 8         # turns executing at once across all managers
+MAX_QUEUED_RUNS = 32            # turns allowed to wait for a slot before new requests get 503
 
 
 ###########################################################################
@@ -36,6 +66,11 @@ def load_persona() -> dict:
         return yaml.safe_load(f)
 
 
+def persona_version() -> str:
+    """Short content hash of persona.yaml, so saved reports expire when the tone changes."""
+    return hashlib.sha256((SRC / "persona" / "persona.yaml").read_bytes()).hexdigest()[:12]
+
+
 def load_db_schema() -> str:
     with open(SRC / "database" / "db_schema.md", "r", encoding="utf-8") as f:
         return f.read()
@@ -0,0 +1,93 @@
+import math
+import re
+from typing import Optional
+
+import pandas as pd
+import sqlglot
+from sqlglot import exp
+
+from src.config import APPROX_ENABLED, APPROX_SAMPLE_PERCENT
+
+FACT_TABLES = ("order_items", "orders")          # large tables worth sampling, in preference order
+SAMPLE_ROWS = "_approx_sample_rows"
+
+# Trends and shares tolerate a sampled answer; exact financial figures never do
+# Leading word boundary: "rate" must not match "generate", "accurate" or "separate"
+APPROX_OK = re.compile(r"\b(?:trend|share|mix|distribution|breakdown|proportion|percent|ratio|rate|pattern|rough|approx|estimate|quick)", re.I)
+EXACT_ONLY = re.compile(r"\b(?:exact|precise|total|invoice|audit|reconcil|how much|sum of)", re.I)
+SCALED = (exp.Count, exp.Sum, exp.CountIf)      # estimates that scale with the sample and carry the error bound
+
+
+def approximation_allowed(question: str) -> bool:
+    return APPROX_ENABLED and bool(APPROX_OK.search(question)) and not EXACT_ONLY.search(question)
+
+
+def sampled_scope(agg: exp.Expression, tree: exp.Select) -> bool:
+    """Whether an aggregate reads the sampled rows and needs scaling.
+
+    Subqueries read unsampled tables. A window function (`SUM(...) OVER ()`) runs over
+    groups, not rows; only the aggregates inside its argument are scaled, so shares
+    like `SUM(x) / SUM(SUM(x)) OVER ()` stay valid and unchanged.
+    """
+    return agg.find_ancestor(exp.Select) is tree and not isinstance(agg.parent, exp.Window)
+
+
+def approximate_sql(sql: str, percent: float = APPROX_SAMPLE_PERCENT) -> Optional[str]:
+    """Rewrite an aggregate query to run on a TABLESAMPLE of its main fact table.
+
+    SUM/COUNT/COUNTIF are scaled back up by 100/percent and a per-group sampled row
+    count is added so the caller can estimate error bounds. Returns None when the
+    query doesn't fit (no aggregates, CTEs, fact table only inside a subquery, ...)
+    or counts distinct values - a sample sees only a fraction of them and that
+    fraction can't be scaled back.
+    """
+    try:
+        tree = sqlglot.parse_one(sql, dialect="bigquery")
+    except sqlglot.errors.ParseError:
+        return None
+    if not isinstance(tree, exp.Select) or tree.args.get("with") or not tree.find(exp.AggFunc):
+        return None
+    distinct = [agg for agg in tree.find_all(exp.Count, exp.ApproxDistinct)
+                if not isinstance(agg, exp.Count) or isinstance(agg.this, exp.Distinct)]
+    if any(agg.find_ancestor(exp.Select) is tree for agg in distinct):
+        return None
+
+    # Sample only one fact table - sampling both sides of a join compounds the fraction
+    outer_tables = [t for t in tree.find_all(exp.Table) if t.find_ancestor(exp.Select) is tree]
+    fact = next((t for name in FACT_TABLES for t in outer_tables if t.name == name), None)
+    if fact is None or fact.args.get("sample"):
+        return None
+    fact.set("sample", exp.TableSample(method=exp.var("SYSTEM"), percent=exp.Literal.number(percent)))
+
+    scale = exp.Literal.number(round(100 / percent, 6))
+    for agg in list(tree.find_all(*SCALED)):
+        if sampled_scope(agg, tree):
+            agg.replace(exp.Paren(this=exp.Mul(this=agg.copy(), expression=scale.copy())))
+
+    tree.select(exp.alias_(exp.Count(this=exp.Star()), SAMPLE_ROWS), copy=False)
+    return tree.sql(dialect="bigquery")
+
+
+def bounded_columns(sql: str) -> list:
+    """Output columns of a query that the error bound covers: those estimated only from
+    scaled SUM/COUNT/COUNTIF. AVG, MIN and MAX over a sample carry no such bound."""
+    tree = sqlglot.parse_one(sql, dialect="bigquery")
+    columns = []
+    for column in tree.expressions:
+        aggs = [agg for agg in column.find_all(exp.AggFunc) if sampled_scope(agg, tree)]
+        if aggs and all(isinstance(agg, SCALED) for agg in aggs):
+            columns.append(column.alias_or_name)
+    return columns
+
+
+def error_bound(df: pd.DataFrame, percent: float = APPROX_SAMPLE_PERCENT) -> tuple[pd.DataFrame, float]:
+    """Drop the helper column and return the worst-group 95% relative error (in %).
+
+    Binomial approximation: rel. error ~ 1.96 * sqrt((1 - f) / n) for n sampled rows.
+    Block-level SYSTEM sampling is noisier than this, so treat it as a lower bound.
+    """
+    if SAMPLE_ROWS not in df.columns:
+        return df, float("nan")
+    fraction = percent / 100
+    smallest = max(int(df[SAMPLE_ROWS].min()), 1)
+    return df.drop(columns=[SAMPLE_ROWS]), 196 * math.sqrt((1 - fraction) / smallest)
@@ -1,8 +1,12 @@
 import logging
+import threading
+from concurrent.futures import CancelledError, TimeoutError
 from typing import Optional, List, Dict, Any
 import pandas as pd
 from google.cloud import bigquery
 
+CANCEL_POLL_SECONDS = 0.5   # how often a cancellable query checks whether it was called off
+
 
 class BigQueryRunner:
     """A lean BigQuery client for executing SQL queries and returning DataFrame results."""
@@ -23,28 +27,62 @@ class BigQueryRunner:
             logging.error(f"Failed to initialize BigQuery client: {str(e)}")
             raise
     
-    def execute_query(self, sql_query: str) -> pd.DataFrame:
+    def execute_query(self, sql_query: str, cancel: Optional[threading.Event] = None) -> pd.DataFrame:
         """Execute a SQL query and return results as a DataFrame.
         
         Args:
             sql_query: The SQL query to execute.
+            cancel: If given and set while the query runs, the BigQuery job is cancelled.
             
         Returns:
             DataFrame containing the query results.
             
         Raises:
+            CancelledError: If the query was cancelled through `cancel`.
             Exception: If query execution fails.
         """
         try:
             logging.info(f"Executing BigQuery query")
             query_job = self.client.query(sql_query)
-            df = query_job.result().to_dataframe()
+            while True:
+                try:
+                    rows = query_job.result(timeout=CANCEL_POLL_SECONDS if cancel else None)
+                    break
+                except TimeoutError:
+                    if cancel.is_set():
+                        query_job.cancel()
+                        logging.info(f"Cancelled BigQuery job {query_job.job_id}")
+                        raise CancelledError("Query cancelled")
+            df = rows.to_dataframe()
             logging.info(f"Query completed successfully, returned {len(df)} rows")
             return df
+        except CancelledError:
+            raise
         except Exception as e:
             logging.error(f"BigQuery execution failed: {str(e)}")
             raise 
 
+    def dry_run(self, sql_query: str) -> int:
+        """Validate a SQL query with a BigQuery dry run (no data is scanned or billed).
+        
+        Args:
+            sql_query: The SQL query to validate.
+            
+        Returns:
+            Number of bytes the query would process.
+            
+        Raises:
+            Exception: If the query is invalid.
+        """
+        try:
+            job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+            query_job = self.client.query(sql_query, job_config=job_config)
+            logging.info(f"Dry run OK, would process {query_job.total_bytes_processed} bytes")
+            return query_job.total_bytes_processed
+        except Exception as e:
+            logging.error(f"BigQuery dry run failed: {str(e)}")
+            raise
+
     def get_table_schema(self, table_name: str) -> List[Dict[str, Any]]:
         """Get schema information for a specific table.
         
@@ -0,0 +1,164 @@
+import re
+import logging
+import threading
+from datetime import datetime, timezone
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+import sqlglot
+from sqlglot import exp
+
+from src.config import INCREMENTAL_CACHE_SIZE
+from src.database.report_store import normalize_sql
+from src.console import print_step
+
+
+###########################################################################
+##                   TIME-BUCKETED QUERY DETECTION
+###########################################################################
+
+@dataclass
+class BucketPlan:
+    tree: exp.Select            # parsed query
+    column: exp.Column          # timestamp column the buckets are built from
+    alias: str                  # output column holding the bucket
+    grain: str                  # "day", "month" or "year"
+    fmt: Optional[str]          # strftime format for FORMAT_TIMESTAMP/FORMAT_DATE buckets
+    order: list                 # [(output column, ascending)] to re-sort the merged result
+
+
+def _grain(bucket: exp.Expression) -> tuple[Optional[str], Optional[str]]:
+    """Granularity (and string format) of a bucket expression, or (None, None)."""
+    if isinstance(bucket, exp.TimeToStr):
+        fmt = bucket.args["format"].name
+        parts = set(re.findall(r"%.", fmt))
+        # Only calendar buckets close: '%m' or '%d' alone (seasonality) groups across all years
+        if "%Y" not in parts or parts - {"%Y", "%m", "%d"} or ("%d" in parts and "%m" not in parts):
+            return None, None
+        return ("day" if "%d" in parts else "month" if "%m" in parts else "year"), fmt
+    if isinstance(bucket, (exp.DateTrunc, exp.TimestampTrunc)):
+        unit = bucket.args["unit"].name.lower()
+        return (unit, None) if unit in ("day", "month", "year") else (None, None)
+    if isinstance(bucket, exp.Date):
+        return "day", None
+    return None, None
+
+
+def plan_incremental(sql: str) -> Optional[BucketPlan]:
+    """Detect `SELECT <time bucket>, <aggregates> ... GROUP BY <time bucket>` queries.
+
+    Every group is computed only from rows inside its own bucket, so restricting the
+    bucket column to a bucket-aligned range drops whole groups and leaves the rest exact.
+    """
+    try:
+        tree = sqlglot.parse_one(sql, dialect="bigquery")
+    except sqlglot.errors.ParseError:
+        return None
+    if not isinstance(tree, exp.Select) or not tree.args.get("group") or any(
+        tree.args.get(arg) for arg in ("limit", "with", "qualify")
+    ) or tree.find(exp.Window):
+        return None
+
+    group = tree.args["group"].expressions
+    outputs = [p.alias_or_name for p in tree.expressions]
+    for position, projection in enumerate(tree.expressions):
+        bucket = projection.unalias()
+        grain, fmt = _grain(bucket)
+        columns = list(bucket.find_all(exp.Column))
+        if not grain or len(columns) != 1:
+            continue
+        grouped = any(
+            g == bucket
+            or (isinstance(g, exp.Column) and g.name == projection.alias_or_name)
+            or (isinstance(g, exp.Literal) and g.name == str(position + 1))
+            for g in group
+        )
+        if not grouped:
+            continue
+
+        # The merged result must be re-sortable from the output columns alone
+        order = []
+        for item in (tree.args["order"].expressions if tree.args.get("order") else []):
+            key = item.this
+            name = outputs[int(key.name) - 1] if isinstance(key, exp.Literal) else getattr(key, "name", None)
+            if name not in outputs:
+                return None
+            order.append((name, not item.args.get("desc")))
+        return BucketPlan(tree, columns[0], projection.alias_or_name, grain, fmt, order)
+    return None
+
+
+def bucket_start(grain: str, now: datetime) -> datetime:
+    """Start of the bucket that is still open (receiving new data) at `now` (UTC)."""
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if grain in ("month", "year"):
+        start = start.replace(day=1)
+    if grain == "year":
+        start = start.replace(month=1)
+    return start
+
+
+###########################################################################
+##                        INCREMENTAL CACHE
+###########################################################################
+
+class IncrementalCache:
+    """Caches closed time buckets of trend queries and only re-queries the open range.
+
+    Queries relative to CURRENT_DATE/CURRENT_TIMESTAMP are keyed by today's date, so the
+    cached buckets are invalidated as soon as the window moves. Absolute and "to date"
+    queries keep their closed buckets and only roll the boundary forward.
+    """
+
+    def __init__(self, runner, size: int = INCREMENTAL_CACHE_SIZE) -> None:
+        self.runner = runner
+        self.size = size
+        self.entries: OrderedDict = OrderedDict()    # key -> (closed bucket rows, boundary)
+        self.lock = threading.Lock()
+
+    def execute(self, sql: str, cancel: Optional[threading.Event] = None) -> pd.DataFrame:
+        plan = plan_incremental(sql)
+        if plan is None:
+            return self.runner.execute_query(sql, cancel)
+
+        now = datetime.now(timezone.utc)
+        key = normalize_sql(sql)
+        if "CURRENT_" in key.upper():
+            key += f"@{now.date()}"
+
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached:
+                self.entries.move_to_end(key)
+
+        if cached:
+            closed, boundary = cached
+            delta = plan.tree.copy().where(
+                exp.GTE(this=plan.column.copy(), expression=exp.func("TIMESTAMP", exp.Literal.string(f"{boundary:%Y-%m-%d %H:%M:%S}"))),
+                dialect="bigquery",
+            )
+            fresh = self.runner.execute_query(delta.sql(dialect="bigquery"), cancel)
+            print_step("Incremental", f"Reused {len(closed)} closed bucket(s), queried from {boundary:%Y-%m-%d}")
+            df = pd.concat([closed, fresh], ignore_index=True) if len(fresh) else closed.copy()
+        else:
+            df = self.runner.execute_query(sql, cancel)
+
+        if plan.order:
+            df = df.sort_values([c for c, _ in plan.order], ascending=[a for _, a in plan.order], ignore_index=True)
+
+        self._store(key, plan, df, bucket_start(plan.grain, now))
+        return df
+
+    def _store(self, key: str, plan: BucketPlan, df: pd.DataFrame, boundary: datetime) -> None:
+        try:
+            starts = pd.to_datetime(df[plan.alias].astype(str), format=plan.fmt, utc=True)
+        except (ValueError, TypeError, KeyError) as e:
+            logging.info(f"Incremental: bucket column not comparable, not caching: {e}")
+            return
+        with self.lock:
+            self.entries[key] = (df[starts < pd.Timestamp(boundary)].reset_index(drop=True), boundary)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
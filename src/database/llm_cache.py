@@ -0,0 +1,117 @@
+import re
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+from src.config import llm, DATA_DIR, LLM_CACHE_MODE, LLM_CACHE_NODES, LLM_CACHE_TTL_HOURS, LLM_CACHE_SIZE
+
+MESSAGE_ID = re.compile(r'"id":\s*"[^"]*",?\s*')   # per-run message ids would make every key unique
+WHITESPACE = re.compile(r"(?:\\n|\\t|\s)+")        # real and JSON-escaped whitespace inside the serialized messages
+CURRENT_DATE = re.compile(r"(Current date: )\d{4}-\d{2}-\d{2}")   # sql_generator's prompt changes every day
+
+
+class ReplayMiss(LookupError):
+    """Raised in replay mode when a prompt was never recorded."""
+
+
+def prompt_key(prompt: str, llm_string: str, pin_date: bool = False) -> str:
+    """Hash of model + parameters (llm_string) and the normalized serialized messages.
+    With pin_date the prompt's current date is left out, so recordings replay on any day."""
+    normalized = WHITESPACE.sub(" ", MESSAGE_ID.sub("", prompt)).strip()
+    if pin_date:
+        normalized = CURRENT_DATE.sub(r"\1<today>", normalized)
+    return hashlib.sha256(f"{llm_string}\n{normalized}".encode()).hexdigest()
+
+
+###########################################################################
+##                          LLM RESPONSE CACHE
+###########################################################################
+
+class LLMCache(BaseCache):
+    """Exact-match SQLite cache of model responses, plugged into LangChain's `cache=` hook.
+
+    Modes: "cache" reuses responses for up to `ttl_hours` and keeps the `size` most
+    recently used; "record" always calls the model and stores every response;
+    "replay" never calls the model and raises ReplayMiss for unknown prompts.
+    Recordings live in their own file (never touched by TTL or LRU eviction) and are
+    keyed without the prompt's current date, so tests and benchmarks replay offline
+    on any later day.
+    """
+
+    def __init__(self, mode: str, path=None,
+                 ttl_hours: float = LLM_CACHE_TTL_HOURS, size: int = LLM_CACHE_SIZE) -> None:
+        path = path or DATA_DIR / ("llm_cache.sqlite" if mode == "cache" else "llm_recordings.sqlite")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.pin_date = mode != "cache"
+        self.ttl = ttl_hours * 3600 if mode == "cache" else None
+        self.size = size if mode == "cache" else None
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key         TEXT PRIMARY KEY,
+                generations TEXT NOT NULL,
+                created_at  REAL NOT NULL,
+                used_at     REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_used ON responses (used_at);
+        """)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if self.mode == "record":
+            return None
+        key = prompt_key(prompt, llm_string, self.pin_date)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT generations, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and self.ttl is not None and row[1] < now - self.ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                row = None
+            elif row:
+                self.conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+        if row is None and self.mode == "replay":
+            raise ReplayMiss(f"No recorded LLM response for prompt {key[:12]} - run once with AGENT_LLM_CACHE=record")
+        return loads(row[0]) if row else None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if self.mode == "replay":
+            return
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (prompt_key(prompt, llm_string, self.pin_date), dumps(list(return_val)), now, now),
+            )
+            if self.size is not None:
+                self.conn.execute(
+                    "DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY used_at DESC LIMIT ?)",
+                    (self.size,),
+                )
+            self.conn.commit()
+
+    def clear(self, **kwargs) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+
+llm_cache = LLMCache(LLM_CACHE_MODE) if LLM_CACHE_MODE != "off" else None
+
+
+def llm_for(node: str):
+    """The shared model, with the response cache attached if this node is cached.
+
+    Normal mode only caches nodes listed in LLM_CACHE_NODES (temperature 0.7 makes
+    the others deliberately varied); record/replay cover every node.
+    """
+    if llm_cache is None or (llm_cache.mode == "cache" and node not in LLM_CACHE_NODES):
+        return llm
+    return llm.model_copy(update={"cache": llm_cache})
@@ -0,0 +1,161 @@
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import ahocorasick
+
+from src.database.pii_scanner import REDACTED
+
+MIN_PATTERN_LENGTH = 5      # shorter values (initials, "n/a") would redact ordinary words
+
+
+def fold(text: str) -> str:
+    """Lowercase without changing the length, so match offsets map back onto the original text."""
+    lowered = text.lower()
+    return lowered if len(lowered) == len(text) else "".join(c.lower()[0] for c in text)
+
+
+def build_automaton(values: Iterable[str]) -> Optional[tuple]:
+    """Compile values into one Aho-Corasick automaton; returns (automaton, longest pattern) or None."""
+    automaton, longest = ahocorasick.Automaton(), 0
+    for value in values:
+        key = fold(str(value).strip())
+        if len(key) >= MIN_PATTERN_LENGTH:
+            automaton.add_word(key, len(key))
+            longest = max(longest, len(key))
+    if not longest:
+        return None
+    automaton.make_automaton()
+    return automaton, longest
+
+
+###########################################################################
+##                            REDACTION
+###########################################################################
+
+class Redaction:
+    """Redacts the PII values of one turn from text in a single linear pass per automaton."""
+
+    def __init__(self, automata: list) -> None:
+        self.automata = [a for a, _ in filter(None, automata)]
+        self.longest = max((n for _, n in filter(None, automata)), default=0)
+
+    def spans(self, text: str, final: bool = True, skip: int = 0) -> list:
+        """Merged [start, stop) ranges of whole-word matches that start at or after `skip`
+        (text before it is only context for the word-boundary check). With final=False a
+        match that touches the end of the text is skipped - the next chunk may continue the word."""
+        folded, found = fold(text), []
+        for automaton in self.automata:
+            for end, length in automaton.iter(folded):
+                start, stop = end - length + 1, end + 1
+                if start < skip or start > 0 and folded[start - 1].isalnum():
+                    continue
+                if stop < len(folded) and folded[stop].isalnum() or (stop == len(folded) and not final):
+                    continue
+                found.append([start, stop])
+        merged = []
+        for start, stop in sorted(found):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], stop)
+            else:
+                merged.append([start, stop])
+        return merged
+
+    def apply(self, text: str, spans: list, offset: int = 0) -> str:
+        parts, last = [], 0
+        for start, stop in spans:
+            parts += [text[last:start - offset], REDACTED]
+            last = stop - offset
+        return "".join(parts) + text[last:]
+
+    def redact(self, text: str) -> str:
+        if not self.automata or not text:
+            return text
+        return self.apply(text, self.spans(text))
+
+    def stream(self) -> "StreamRedactor":
+        return StreamRedactor(self)
+
+
+class StreamRedactor:
+    """Incremental redaction over streamed chunks (e.g. LLM tokens).
+
+    Only the last `longest` characters are held back - a match still in progress
+    must start there - so text goes out almost as fast as it comes in.
+    """
+
+    def __init__(self, redaction: Redaction) -> None:
+        self.redaction = redaction
+        self.before = ""        # last emitted character, for the word-boundary check
+        self.buffer = ""
+
+    def feed(self, chunk: str) -> str:
+        if not self.redaction.automata:
+            return chunk
+        self.buffer += chunk
+        text, skip = self.before + self.buffer, len(self.before)
+        spans = self.redaction.spans(text, final=False, skip=skip)
+
+        cut = len(text) - self.redaction.longest
+        for start, stop in spans:
+            if start < cut < stop:
+                cut = start         # keep a complete match whole, it is found again next time
+        if cut <= skip:
+            return ""
+
+        emitted = self.redaction.apply(text[skip:cut], [s for s in spans if s[1] <= cut], offset=skip)
+        self.before, self.buffer = text[cut - 1], text[cut:]
+        return emitted
+
+    def flush(self) -> str:
+        text, self.buffer = self.buffer, ""
+        if not self.redaction.automata:
+            return text
+        full = self.before + text
+        return self.redaction.apply(text, self.redaction.spans(full, skip=len(self.before)), offset=len(self.before))
+
+
+###########################################################################
+##                           PII REDACTOR
+###########################################################################
+
+class PiiRedactor:
+    """Output-side PII layer for report text: no second LLM call, no regex per value.
+
+    The users PII dimension (full names, emails, addresses) is compiled once; the values
+    masked in the current turn's results are compiled per turn. Turn values are kept
+    in memory only, keyed by result handle - they are never written next to the rows.
+    """
+
+    def __init__(self, scanner, size: int = 256) -> None:
+        self.scanner = scanner
+        self.size = size
+        self.turn_values: OrderedDict = OrderedDict()    # result handle -> masked values
+        self.lock = threading.Lock()
+        self._dimension = None
+        self._dimension_values = None    # the scanner set the automaton was built from
+
+    @property
+    def dimension(self) -> Optional[tuple]:
+        """Automaton over the scanner's dimension, rebuilt whenever the scanner's set changes."""
+        values = self.scanner.dimension
+        with self.lock:
+            if values is not self._dimension_values:
+                self._dimension = build_automaton(values)
+                self._dimension_values = values
+        return self._dimension
+
+    def remember(self, handle: str, values: Iterable[str]) -> None:
+        values = frozenset(values)
+        if not handle or not values:
+            return
+        with self.lock:
+            self.turn_values[handle] = values
+            self.turn_values.move_to_end(handle)
+            while len(self.turn_values) > self.size:
+                self.turn_values.popitem(last=False)
+
+    def for_turn(self, handles: Iterable[str]) -> Redaction:
+        with self.lock:
+            values = set().union(*(self.turn_values.get(h, ()) for h in handles if h))
+        return Redaction([self.dimension, build_automaton(values)])
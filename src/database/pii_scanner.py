@@ -0,0 +1,97 @@
+import logging
+import threading
+from typing import Optional
+
+import pandas as pd
+
+from src.config import PII_DIMENSION_CHECK, PII_DROP_RATIO
+
+REDACTED = "[REDACTED]"
+
+# One alternation so each column is scanned in a single regex pass (runs on Arrow's RE2 kernels)
+PII_PATTERN = "|".join([
+    r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+\.[A-Za-z0-9.-]+",                                   # email
+    r"(?:\+\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}\b",                           # phone
+    # Street address: house number, capitalized name, suffix. Suffixes that also occur in product
+    # names ("3 Stripe Court Sneaker", "2 Way Zip") are left to the users dimension check.
+    r"\b\d{1,5}\s+(?:[A-Z][A-Za-z.'-]*\s+){1,4}"
+    r"(?i:street|avenue|ave|road|rd|boulevard|blvd|lane|ln|drive|place|parkway|pkwy)\b",
+])
+
+
+class PiiScanner:
+    """Value-level PII scan over every string column of a result DataFrame.
+
+    Catches what column-name filtering misses: aliased PII (`email AS contact`),
+    CONCAT'ed names and emails inside free text. Matches are checked with vectorized
+    Arrow string kernels on the column's unique values, then masked (or the whole
+    column dropped when most of it is PII).
+    """
+
+    def __init__(self, runner) -> None:
+        self.runner = runner
+        self.lock = threading.Lock()
+        self._dimension = None
+        self._dimension_index = None
+
+    @property
+    def dimension(self) -> set:
+        """Known PII values from the users table (emails, full names, street addresses), loaded once."""
+        self._load()
+        return self._dimension
+
+    @property
+    def dimension_index(self) -> pd.Index:
+        """The dimension as a hashed index, for vectorized lookups."""
+        self._load()
+        return self._dimension_index
+
+    def _load(self) -> None:
+        """Concurrent first callers wait for the users query instead of scanning without it."""
+        with self.lock:
+            if self._dimension is None:
+                dimension = set()
+                if PII_DIMENSION_CHECK:
+                    try:
+                        df = self.runner.execute_query(
+                            "SELECT LOWER(email) AS v FROM `bigquery-public-data.thelook_ecommerce.users` UNION DISTINCT "
+                            "SELECT LOWER(CONCAT(first_name, ' ', last_name)) FROM `bigquery-public-data.thelook_ecommerce.users` UNION DISTINCT "
+                            "SELECT LOWER(street_address) FROM `bigquery-public-data.thelook_ecommerce.users`"
+                        )
+                        dimension = set(df["v"].dropna())
+                    except Exception as e:
+                        logging.warning(f"PII dimension unavailable, using patterns only: {e}")
+                # Hashed once here - `isin(set)` would rebuild a hash table per column
+                self._dimension_index = pd.Index(list(dimension), dtype=object)
+                self._dimension = dimension
+
+    def scan(self, df: pd.DataFrame, matched: Optional[set] = None) -> tuple[pd.DataFrame, dict]:
+        """Mask PII cells; returns the sanitized DataFrame and {column: cells matched}.
+        The masked values themselves are added to `matched` if given."""
+        found = {}
+        for col in df.columns:
+            if not (pd.api.types.is_string_dtype(df[col]) or df[col].dtype == object):
+                continue
+
+            # Work on unique values - results repeat a lot (categories, statuses)
+            values = df[col].dropna().astype(str).unique()
+            if not len(values):
+                continue
+            uniques = pd.Series(values, dtype="string[pyarrow]")
+            hits = uniques.str.contains(PII_PATTERN, regex=True)
+            if self.dimension:
+                keys = uniques.str.strip().str.lower().to_numpy(dtype=object)
+                hits |= self.dimension_index.get_indexer(keys) >= 0
+            if not hits.any():
+                continue
+
+            if matched is not None:
+                matched.update(uniques[hits])
+            mask = df[col].astype(str).isin(set(uniques[hits]))
+            found[col] = int(mask.sum())
+            if mask.mean() >= PII_DROP_RATIO:
+                df = df.drop(columns=[col])
+            else:
+                df = df.astype({col: object})
+                df.loc[mask, col] = REDACTED
+        return df, found
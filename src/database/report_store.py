@@ -0,0 +1,114 @@
+import re
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Optional
+
+import pandas as pd
+import sqlglot
+
+from src.config import DATA_DIR
+
+
+###########################################################################
+##                          KEY HELPERS
+###########################################################################
+
+def normalize_question(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", text.lower())).strip()
+
+
+def question_key(messages: list, question: str) -> str:
+    """Key a question together with the previous user turn, so follow-ups like
+    'break that down by month' only match when asked after the same question."""
+    previous = [m.content for m in messages if m.type == "human"][:-1]
+    context = normalize_question(previous[-1]) if previous else ""
+    return f"{context}\n{normalize_question(question)}"
+
+
+def normalize_sql(sql: str) -> str:
+    """Canonical SQL text so formatting/casing differences hit the same entry."""
+    try:
+        return sqlglot.parse_one(sql, dialect="bigquery").sql(dialect="bigquery", normalize=True)
+    except sqlglot.errors.ParseError:
+        return re.sub(r"\s+", " ", sql).strip().lower()
+
+
+def result_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a result set - changes whenever the underlying data does."""
+    digest = hashlib.sha256("|".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df.astype(str), index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+###########################################################################
+##                          REPORT STORE
+###########################################################################
+
+class ReportStore:
+    """SQLite library of generated reports, indexed by question and by SQL + result fingerprint."""
+
+    def __init__(self, path=DATA_DIR / "reports.sqlite") -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reports (
+                id                 INTEGER PRIMARY KEY,
+                question           TEXT NOT NULL,
+                question_key       TEXT NOT NULL,
+                sql_key            TEXT NOT NULL,
+                result_fingerprint TEXT NOT NULL,
+                persona_version    TEXT NOT NULL,
+                report             TEXT NOT NULL,
+                created_at         REAL NOT NULL,
+                UNIQUE (question_key, persona_version)
+            );
+            CREATE INDEX IF NOT EXISTS idx_reports_sql ON reports (sql_key, persona_version);
+        """)
+
+    def find_by_question(self, key: str, persona_version: str, max_age_hours: float) -> Optional[str]:
+        """Reuse a report for the same question if it is still inside the freshness window."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT report FROM reports WHERE question_key = ? AND persona_version = ? AND created_at >= ?",
+                (key, persona_version, time.time() - max_age_hours * 3600),
+            ).fetchone()
+        return row[0] if row else None
+
+    def find_by_result(self, sql: str, fingerprint: str, persona_version: str) -> Optional[str]:
+        """Reuse a report written over the exact same SQL and result set."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT report FROM reports WHERE sql_key = ? AND persona_version = ? AND result_fingerprint = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (normalize_sql(sql), persona_version, fingerprint),
+            ).fetchone()
+        return row[0] if row else None
+
+    def save(self, question: str, key: str, sql: str, fingerprint: str, persona_version: str, report: str) -> None:
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reports "
+                "(question, question_key, sql_key, result_fingerprint, persona_version, report, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (question, key, normalize_sql(sql), fingerprint, persona_version, report, time.time()),
+            )
+
+    ########  Invalidation  ########
+    def invalidate_persona(self, persona_version: str) -> int:
+        """Drop reports written with an older persona.yaml."""
+        with self.lock, self.conn:
+            return self.conn.execute("DELETE FROM reports WHERE persona_version != ?", (persona_version,)).rowcount
+
+    def invalidate_changed_data(self, sql: str, fingerprint: str) -> int:
+        """Drop reports for this SQL whose results no longer match the warehouse."""
+        with self.lock, self.conn:
+            return self.conn.execute(
+                "DELETE FROM reports WHERE sql_key = ? AND result_fingerprint != ?",
+                (normalize_sql(sql), fingerprint),
+            ).rowcount
+
+
+report_store = ReportStore()
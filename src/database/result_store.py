@@ -0,0 +1,59 @@
+import re
+import uuid
+import shutil
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import DATA_DIR, RESULT_RETENTION
+
+
+class ResultStore:
+    """Out-of-band store for query results.
+
+    Rows are spilled to Parquet files and only a short handle (`<thread>/<id>`) goes
+    into AgentState, so checkpoints stay the same size no matter how big the result is.
+    Files are garbage collected per thread: only the newest `keep` results are kept,
+    matching how far back a conversation realistically gets replayed.
+    """
+
+    def __init__(self, root: Path = DATA_DIR / "results", keep: int = RESULT_RETENTION) -> None:
+        self.root = root
+        self.keep = keep
+
+    def put(self, df: pd.DataFrame, thread_id: str) -> str:
+        """Spill a DataFrame to disk and return its handle."""
+        thread_dir = self.root / self._safe(thread_id)
+        thread_dir.mkdir(parents=True, exist_ok=True)
+        handle = f"{thread_dir.name}/{uuid.uuid4().hex}"
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), self.root / f"{handle}.parquet")
+        self._collect(thread_dir)
+        return handle
+
+    def load(self, handle: str) -> pd.DataFrame:
+        """Read a result back from its Parquet file (memory-mapped while reading; the
+        DataFrame itself is a copy, but nothing is ever copied into the checkpoint)."""
+        return pq.read_table(self.root / f"{handle}.parquet", memory_map=True).to_pandas()
+
+    def rows(self, handle: str) -> list:
+        return self.load(handle).to_dict(orient="records") if handle else []
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Drop every result of a thread (the server calls this when it deletes the thread)."""
+        shutil.rmtree(self.root / self._safe(thread_id), ignore_errors=True)
+
+    def _collect(self, thread_dir: Path) -> None:
+        files = sorted(thread_dir.glob("*.parquet"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in files[self.keep:]:
+            old.unlink(missing_ok=True)
+            logging.info(f"Result store: collected {old.name}")
+
+    @staticmethod
+    def _safe(thread_id: str) -> str:
+        return re.sub(r"[^\w-]", "_", str(thread_id)) or "default"
+
+
+result_store = ResultStore()
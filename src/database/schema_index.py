@@ -0,0 +1,165 @@
+import re
+import json
+import time
+from collections import deque
+
+import sqlglot
+from sqlglot import exp
+
+from src.config import DATA_DIR, load_db_schema
+
+
+###########################################################################
+##                 DESCRIPTIONS (business vocabulary)
+###########################################################################
+
+# Words managers use that don't appear in table/column names
+TABLE_DESCRIPTIONS = {
+    "orders": "order orders status shipped delivered returned cancelled processing complete fulfillment shipping delivery",
+    "order_items": "revenue sales sold sell selling spend spent spending price item items unit units purchase bought returns returned line",
+    "products": "product products category categories brand brands department men women jeans apparel clothing cost margin profit sku catalog distribution center",
+    "users": "customer customers user users age gender demographic country countries usa uk city state region location traffic source channel signup",
+}
+COLUMN_DESCRIPTIONS = {
+    "sale_price": "revenue sales price spend spent amount",
+    "cost": "margin profit",
+    "retail_price": "price list msrp",
+    "traffic_source": "traffic channel source marketing acquisition",
+    "created_at": "date time month year day week trend period when",
+    "returned_at": "return returns returned",
+    "delivered_at": "delivery delivered",
+    "shipped_at": "shipping shipped",
+    "num_of_item": "items quantity basket size",
+}
+
+
+def _tokens(text: str) -> set:
+    words = re.findall(r"[a-z0-9]+", text.lower().replace("_", " "))
+    return {w[:-1] if len(w) > 3 and w.endswith("s") else w for w in words}
+
+
+###########################################################################
+##                          SCHEMA INDEX
+###########################################################################
+
+class SchemaIndex:
+    """Precomputed index of db_schema.md: tables, columns, descriptions and join paths.
+
+    `link()` picks the tables a question needs plus the join keys connecting them,
+    and renders only that subset in the same markdown format as db_schema.md.
+    """
+
+    def __init__(self, schema_md: str) -> None:
+        self.full_text = schema_md
+        self.tables, self.joins = {}, []
+        current = None
+        for line in schema_md.splitlines():
+            if line.startswith("## ") and line[3:].strip() != "Relationships":
+                current = line[3:].split("(")[0].strip()
+                self.tables[current] = {"header": line, "columns": {}}
+            elif current and re.match(r"\|\s*\w", line) and not line.startswith("| Column"):
+                name = line.split("|")[1].strip().rstrip("*").strip()
+                self.tables[current]["columns"][name] = line
+            elif m := re.match(r"- `(\w+)\.(\w+)` -> `(\w+)\.(\w+)`", line):
+                self.joins.append(m.groups())
+
+        # Token -> tables it points at (names, column names and descriptions)
+        self.vocab = {}
+        for table, info in self.tables.items():
+            words = _tokens(table) | _tokens(TABLE_DESCRIPTIONS.get(table, ""))
+            for column in info["columns"]:
+                words |= _tokens(column) | _tokens(COLUMN_DESCRIPTIONS.get(column, ""))
+            for word in words:
+                self.vocab.setdefault(word, set()).add(table)
+        # Words shared by most tables ("id", "created", "status") don't discriminate
+        self.vocab = {w: t for w, t in self.vocab.items() if len(t) <= len(self.tables) // 2}
+
+    def select_tables(self, question: str) -> set:
+        """Tables mentioned by the question, plus any tables on the join path between them."""
+        selected = {t for word in _tokens(question) for t in self.vocab.get(word, ())}
+        if not selected or len(selected) == len(self.tables):
+            return set(self.tables)
+        return self._connect(selected)
+
+    def _connect(self, tables: set) -> set:
+        """Add intermediate tables so every selected table is reachable by a join (BFS)."""
+        graph = {}
+        for a, _, b, _ in self.joins:
+            graph.setdefault(a, set()).add(b)
+            graph.setdefault(b, set()).add(a)
+        connected, pending = {min(tables)}, set(tables) - {min(tables)}
+        while pending:
+            target = pending.pop()
+            parents, queue = {t: None for t in connected}, deque(connected)
+            while queue and target not in parents:
+                node = queue.popleft()
+                for nxt in graph.get(node, ()):
+                    if nxt not in parents:
+                        parents[nxt] = node
+                        queue.append(nxt)
+            node = target if target in parents else None
+            while node is not None and node not in connected:
+                connected.add(node)
+                node = parents[node]
+            connected.add(target)
+        return connected
+
+    def link(self, question: str) -> str:
+        """Markdown schema for only the tables (and join keys) this question needs."""
+        tables = self.select_tables(question)
+        if tables == set(self.tables):
+            return self.full_text
+        parts = [self.full_text.splitlines()[0], ""]
+        for table in self.tables:
+            if table in tables:
+                info = self.tables[table]
+                parts += [info["header"], "| Column | Type |", "|--------|------|", *info["columns"].values(), ""]
+        parts.append("## Relationships")
+        parts += [f"- `{a}.{ac}` -> `{b}.{bc}`" for a, ac, b, bc in self.joins if a in tables and b in tables]
+        return "\n".join(parts)
+
+    ########  Recall against golden SQL  ########
+    def recall(self, question: str, sql: str) -> dict:
+        """Share of the tables/columns used by a reference SQL that the linked subset contains."""
+        tree = sqlglot.parse_one(sql, dialect="bigquery")
+        used_tables = {t.name for t in tree.find_all(exp.Table) if t.name in self.tables}
+        used_columns = {c.name for c in tree.find_all(exp.Column)
+                        if any(c.name in self.tables[t]["columns"] for t in used_tables)}
+        linked = self.select_tables(question)
+        linked_columns = {c for t in linked for c in self.tables[t]["columns"]}
+        return {
+            "table_recall": len(used_tables & linked) / len(used_tables) if used_tables else 1.0,
+            "column_recall": len(used_columns & linked_columns) / len(used_columns) if used_columns else 1.0,
+            "tables_sent": len(linked),
+        }
+
+
+schema_index = SchemaIndex(load_db_schema())
+
+
+###########################################################################
+##              EVALUATION: python -m src.database.schema_index
+###########################################################################
+
+if __name__ == "__main__":
+    from src.golden_knowledge.golden_index import golden_index
+
+    scores = []
+    for example in golden_index.examples:
+        score = schema_index.recall(example["question"], example["sql"])
+        scores.append(score)
+        print(f"{score['table_recall']:.2f}  {score['column_recall']:.2f}  {score['tables_sent']}  {example['question']}")
+
+    summary = {
+        "time": time.time(),
+        "examples": len(scores),
+        "table_recall": sum(s["table_recall"] for s in scores) / len(scores),
+        "column_recall": sum(s["column_recall"] for s in scores) / len(scores),
+        "avg_tables_sent": sum(s["tables_sent"] for s in scores) / len(scores),
+    }
+    print(json.dumps(summary, indent=2))
+
+    # Keep a history so changes to the descriptions can be compared run over run
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(DATA_DIR / "schema_linking_recall.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(summary) + "\n")
@@ -0,0 +1,131 @@
+import json
+import hashlib
+import threading
+from typing import Optional
+
+import numpy as np
+import sqlglot
+from sqlglot import exp
+
+from src.config import SRC, DATA_DIR, GOLDEN_DUPLICATE_THRESHOLD
+from src.database.report_store import normalize_question, normalize_sql
+
+GOLDEN_FILE = SRC / "golden_knowledge" / "golden_knowledge.json"     # curated by analysts
+LEARNED_FILE = DATA_DIR / "learned_knowledge.json"                   # grown by the learning loop
+
+
+###########################################################################
+##                     MINHASH / SQL FINGERPRINTS
+###########################################################################
+
+NUM_PERM = 64
+BANDS = 16                      # 16 bands x 4 rows -> LSH candidates from ~0.5 Jaccard up
+ROWS = NUM_PERM // BANDS
+
+_rng = np.random.default_rng(42)
+_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature over character 4-gram shingles of the normalized question."""
+    norm = normalize_question(text)
+    shingles = {norm[i:i + 4] for i in range(max(len(norm) - 3, 1))}
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") for s in shingles],
+        dtype=np.uint64,
+    )
+    return (_A[:, None] * hashes[None, :] + _B[:, None]).min(axis=1)
+
+
+def sql_fingerprint(sql: str) -> str:
+    """Hash of the normalized SQL with literals stripped - 'top 5' and 'top 10' share a fingerprint."""
+    try:
+        tree = sqlglot.parse_one(sql, dialect="bigquery")
+        for literal in list(tree.find_all(exp.Literal)):
+            literal.replace(exp.Placeholder())
+        text = tree.sql(dialect="bigquery", normalize=True)
+    except sqlglot.errors.ParseError:
+        text = normalize_sql(sql)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+###########################################################################
+##                          GOLDEN INDEX
+###########################################################################
+
+class GoldenIndex:
+    """Curated + learned golden trios with an incrementally updated MinHash/LSH index.
+
+    Used both to retrieve the most similar examples for the SQL prompt and to reject
+    near-duplicate candidates, so the bucket grows without the prompt growing.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        self.examples, self.signatures, self.buckets, self.sql_prints = [], [], {}, {}
+        self.mtime = GOLDEN_FILE.stat().st_mtime
+        learned = json.loads(LEARNED_FILE.read_text(encoding="utf-8")) if LEARNED_FILE.exists() else []
+        for example in json.loads(GOLDEN_FILE.read_text(encoding="utf-8")) + learned:
+            self._add(example)
+
+    def _add(self, example: dict) -> None:
+        idx = len(self.examples)
+        signature = minhash(example["question"])
+        self.examples.append(example)
+        self.signatures.append(signature)
+        for band in range(BANDS):
+            self.buckets.setdefault((band, signature[band * ROWS:(band + 1) * ROWS].tobytes()), []).append(idx)
+        self.sql_prints.setdefault(sql_fingerprint(example["sql"]), idx)
+
+    def refresh(self) -> None:
+        """Pick up hand edits to the curated file (the learned file only changes through ingest)."""
+        if GOLDEN_FILE.stat().st_mtime != self.mtime:
+            self._load()
+
+    def _scored(self, signature: np.ndarray, candidates) -> list:
+        return sorted(((float((self.signatures[i] == signature).mean()), i) for i in candidates), reverse=True)
+
+    def _candidates(self, signature: np.ndarray) -> set:
+        return {i for band in range(BANDS)
+                for i in self.buckets.get((band, signature[band * ROWS:(band + 1) * ROWS].tobytes()), [])}
+
+    def search(self, question: str, k: int) -> list:
+        """Top-k most similar examples; falls back to a full scan when LSH finds too few."""
+        with self.lock:
+            self.refresh()
+            signature = minhash(question)
+            candidates = self._candidates(signature)
+            if len(candidates) < k:
+                candidates = range(len(self.examples))
+            return [self.examples[i] for _, i in self._scored(signature, candidates)[:k]]
+
+    def find_duplicate(self, question: str, sql: str) -> Optional[dict]:
+        """Existing example with the same SQL shape or a near-identical question."""
+        idx = self.sql_prints.get(sql_fingerprint(sql))
+        if idx is not None:
+            return self.examples[idx]
+        signature = minhash(question)
+        for score, i in self._scored(signature, self._candidates(signature)):
+            if score >= GOLDEN_DUPLICATE_THRESHOLD:
+                return self.examples[i]
+        return None
+
+    def ingest(self, question: str, sql: str, report: str) -> bool:
+        """Add a successful trio to the learned bucket unless it is a near-duplicate."""
+        with self.lock:
+            self.refresh()
+            if self.find_duplicate(question, sql):
+                return False
+            example = {"question": question, "sql": sql, "report": report}
+            learned = json.loads(LEARNED_FILE.read_text(encoding="utf-8")) if LEARNED_FILE.exists() else []
+            LEARNED_FILE.parent.mkdir(parents=True, exist_ok=True)
+            LEARNED_FILE.write_text(json.dumps(learned + [example], indent=2), encoding="utf-8")
+            self._add(example)
+            return True
+
+
+golden_index = GoldenIndex()
@@ -1,10 +1,12 @@
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 
 from src.state import AgentState
 from src.config import MAX_RETRIES
 from src.nodes import (
-    router, golden_knowledge, sql_generator, sql_executor,
-    report_writer, general_response, delete_reports,
+    report_cache, router, golden_knowledge, schema_linker, sql_generator, sql_executor,
+    query_planner, sub_query,
+    report_writer, golden_ingest, general_response, delete_reports,
 )
 
 
@@ -12,6 +14,10 @@ from src.nodes import (
 ##                       CONDITIONAL EDGES
 ###########################################################################
 
+def route_after_cache(state: AgentState) -> str:
+    return END if state.get("cache_hit") else "router"
+
+
 def route_by_intent(state: AgentState) -> str:
     if state.get("intent") == "general":
         return "general_response"
@@ -20,6 +26,22 @@ def route_by_intent(state: AgentState) -> str:
     return "golden_knowledge"
 
 
+def route_after_knowledge(state: AgentState) -> str:
+    return "query_planner" if state.get("intent") == "analysis" else "schema_linker"
+
+
+def fan_out_sub_queries(state: AgentState) -> list[Send]:
+    """One parallel sub_query per planned sub-question (LangGraph Send fan-out)."""
+    history = "\n".join(f"{m.type}: {m.content}" for m in state["messages"][-6:])
+    return [
+        Send("sub_query", {
+            "index": i, "question": question, "history": history,
+            "golden_examples": state.get("golden_examples", ""),
+        })
+        for i, question in enumerate(state["sub_questions"])
+    ]
+
+
 def route_after_execution(state: AgentState) -> str:
     if state.get("error_message") and state.get("retry_count", 0) < MAX_RETRIES:
         return "sql_generator"
@@ -32,15 +54,24 @@ def route_after_execution(state: AgentState) -> str:
 
 workflow = StateGraph(AgentState)
 
+workflow.add_node("report_cache", report_cache)
 workflow.add_node("router", router)
 workflow.add_node("golden_knowledge", golden_knowledge)
+workflow.add_node("schema_linker", schema_linker)
 workflow.add_node("sql_generator", sql_generator)
 workflow.add_node("sql_executor", sql_executor)
+workflow.add_node("query_planner", query_planner)
+workflow.add_node("sub_query", sub_query)
 workflow.add_node("report_writer", report_writer)
+workflow.add_node("golden_ingest", golden_ingest)
 workflow.add_node("general_response", general_response)
 workflow.add_node("delete_reports", delete_reports)
 
-workflow.add_edge(START, "router")
+workflow.add_edge(START, "report_cache")
+workflow.add_conditional_edges("report_cache", route_after_cache, {
+    "router": "router",
+    END: END,
+})
 
 workflow.add_conditional_edges("router", route_by_intent, {
     "golden_knowledge": "golden_knowledge",
@@ -48,14 +79,21 @@ workflow.add_conditional_edges("router", route_by_intent, {
     "delete_reports": "delete_reports",
 })
 
-workflow.add_edge("golden_knowledge", "sql_generator")
+workflow.add_conditional_edges("golden_knowledge", route_after_knowledge, {
+    "schema_linker": "schema_linker",
+    "query_planner": "query_planner",
+})
+workflow.add_conditional_edges("query_planner", fan_out_sub_queries, ["sub_query"])
+workflow.add_edge("sub_query", "report_writer")
+workflow.add_edge("schema_linker", "sql_generator")
 workflow.add_edge("sql_generator", "sql_executor")
 workflow.add_conditional_edges("sql_executor", route_after_execution, {
     "sql_generator": "sql_generator",
     "report_writer": "report_writer",
 })
 
-workflow.add_edge("report_writer", END)
+workflow.add_edge("report_writer", "golden_ingest")
+workflow.add_edge("golden_ingest", END)
 workflow.add_edge("general_response", END)
 workflow.add_edge("delete_reports", END)
 
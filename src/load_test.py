@@ -0,0 +1,257 @@
+"""
+Load generator: many concurrent manager sessions against the compiled graph, offline.
+
+    python src/load_test.py --sessions 50 --turns 3 --llm-latency 1.0 --warehouse-latency 0.5
+
+The chat model and BigQuery are replaced by latency-injecting stand-ins (golden SQL and
+reports as answers, synthetic rows shaped like each query's SELECT list), and all runtime
+data goes to a temporary AGENT_DATA_DIR. Each session asks a question from
+questions/test_questions.md followed by scripted follow-ups on its own thread, like
+src/server.py does. Reports throughput, p50/p95/p99 turn latency, peak RSS and
+checkpoint size per turn.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import os
+import re
+import json
+import time
+import zlib
+import random
+import asyncio
+import argparse
+import resource
+import tempfile
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import sqlglot
+from sqlglot import exp
+from langchain_core.messages import AIMessage
+
+# Runtime data and model setup must be decided before src.config is imported
+os.environ.setdefault("AGENT_DATA_DIR", tempfile.mkdtemp(prefix="agent-load-"))
+os.environ.setdefault("GOOGLE_API_KEY_PAID", "load-test")   # never used, the model is replaced
+os.environ["AGENT_LLM_CACHE"] = "off"
+
+from src.config import SRC, DATA_DIR
+
+FOLLOW_UPS = [
+    "break that down by month",
+    "only for the last quarter",
+    "which of those grew the fastest?",
+    "now compare that to the previous year",
+    "show the top 5 only",
+]
+ANALYSIS_QUESTIONS = ["Why is the Jeans category underperforming this year?"]
+
+
+def jitter(mean: float) -> float:
+    return random.uniform(0.5, 1.5) * mean
+
+
+###########################################################################
+##                            STAND-INS
+###########################################################################
+
+class FakeLLM:
+    """Chat model stand-in: answers with golden SQL/reports after an injected delay."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.examples = json.loads((SRC / "golden_knowledge" / "golden_knowledge.json").read_text(encoding="utf-8"))
+
+    def _example(self, messages: list) -> dict:
+        return self.examples[zlib.crc32(messages[-1].content.encode()) % len(self.examples)]
+
+    def invoke(self, messages: list, config=None, **kwargs) -> AIMessage:
+        time.sleep(jitter(self.latency))
+        example = self._example(messages)
+        return AIMessage(content=example["sql"] if "SQL expert" in messages[0].content else example["report"])
+
+    def batch(self, inputs: list, config=None, **kwargs) -> list:
+        with ThreadPoolExecutor(max_workers=len(inputs)) as pool:
+            return list(pool.map(self.invoke, inputs))
+
+    def with_structured_output(self, schema, **kwargs) -> "FakeStructured":
+        return FakeStructured(self, schema)
+
+
+class FakeStructured:
+    """Structured-output stand-in for the router (RouteIntent) and planner (QueryPlan)."""
+
+    def __init__(self, llm: FakeLLM, schema) -> None:
+        self.llm = llm
+        self.schema = schema
+
+    def invoke(self, messages: list, config=None, **kwargs):
+        time.sleep(jitter(self.llm.latency))
+        question = messages[-1].content
+        if "intent" in self.schema.model_fields:
+            return self.schema(intent="analysis" if question.lower().startswith("why") else "data_query")
+        if "sub_questions" in self.schema.model_fields:
+            return self.schema(sub_questions=[f"{question} - revenue trend", f"{question} - category mix", f"{question} - return rate"])
+        raise ValueError(f"No fake answer for {self.schema.__name__}")
+
+
+class FakeWarehouse:
+    """BigQueryRunner stand-in: synthetic rows shaped like the query's outer SELECT list."""
+
+    latency = 0.5
+    rows = 12
+
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def execute_query(self, sql_query: str, cancel=None) -> pd.DataFrame:
+        time.sleep(jitter(self.latency))
+        select = sqlglot.parse_one(sql_query, dialect="bigquery")
+        while not isinstance(select, exp.Select):    # UNIONs take their columns from the left-most SELECT
+            select = select.this
+        limit = select.args.get("limit")
+        n = int(limit.expression.name) if limit and limit.expression.is_int else self.rows
+        rng = random.Random(zlib.crc32(sql_query.encode()))
+        return pd.DataFrame({
+            p.alias_or_name: [round(rng.uniform(10, 10_000), 2) for _ in range(n)]
+            if p.find(exp.AggFunc, exp.Binary) else [f"{p.alias_or_name} {i + 1}" for i in range(n)]
+            for p in select.expressions
+        })
+
+    def dry_run(self, sql_query: str) -> int:
+        time.sleep(jitter(self.latency / 5))
+        return 0
+
+
+###########################################################################
+##                            SESSIONS
+###########################################################################
+
+@dataclass
+class Turn:
+    session: int
+    turn: int
+    latency: float
+    checkpoint_bytes: int
+    cache_hit: bool
+    error: str
+
+
+def load_questions() -> list:
+    text = (SRC / "questions" / "test_questions.md").read_text(encoding="utf-8")
+    return re.findall(r'\*\*Question:\*\* "(.+?)"', text) + ANALYSIS_QUESTIONS
+
+
+def script(session: int, turns: int, questions: list) -> list:
+    rng = random.Random(session)
+    return [rng.choice(questions)] + [rng.choice(FOLLOW_UPS) for _ in range(turns - 1)]
+
+
+def checkpoint_bytes(graph, config: dict) -> int:
+    checkpoint = graph.checkpointer.get_tuple(config)
+    return len(graph.checkpointer.serde.dumps_typed(checkpoint.checkpoint)[1]) if checkpoint else 0
+
+
+async def run_session(graph, session: int, questions: list, slots: asyncio.Semaphore, turns: list) -> None:
+    from langgraph.types import Command
+    from src.state import new_turn
+
+    config = {"configurable": {"thread_id": f"load-{session}"}}
+    async with slots:
+        for index, question in enumerate(questions):
+            start, error, result = time.perf_counter(), "", {}
+            try:
+                result = await graph.ainvoke(new_turn(question), config)
+                while result.get("__interrupt__"):
+                    result = await graph.ainvoke(Command(resume="no"), config)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            turns.append(Turn(session, index, time.perf_counter() - start, checkpoint_bytes(graph, config),
+                              bool(result.get("cache_hit")), error))
+
+
+###########################################################################
+##                             REPORT
+###########################################################################
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # KB on Linux
+
+
+def summarize(turns: list, wall: float, rss_before: float, graph) -> dict:
+    ok = [t for t in turns if not t.error]
+    latencies = np.array([t.latency for t in ok]) if ok else np.zeros(1)
+    per_turn = {}
+    for index in sorted({t.turn for t in ok}):
+        sizes = [t.checkpoint_bytes for t in ok if t.turn == index]
+        per_turn[f"turn_{index + 1}"] = round(sum(sizes) / len(sizes) / 1024, 1)
+    return {
+        "turns": len(turns),
+        "errors": len(turns) - len(ok),
+        "report_cache_hits": sum(t.cache_hit for t in ok),
+        "wall_seconds": round(wall, 2),
+        "throughput_turns_per_s": round(len(ok) / wall, 2),
+        "latency_p50_s": round(float(np.percentile(latencies, 50)), 2),
+        "latency_p95_s": round(float(np.percentile(latencies, 95)), 2),
+        "latency_p99_s": round(float(np.percentile(latencies, 99)), 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+        "checkpoint_kb_by_turn": per_turn,
+        "checkpoints_stored": sum(1 for _ in graph.checkpointer.list(None)),
+        "data_dir_mb": round(sum(f.stat().st_size for f in DATA_DIR.rglob("*") if f.is_file()) / 2**20, 2),
+        "first_errors": sorted({t.error for t in turns if t.error})[:5],
+    }
+
+
+###########################################################################
+##                              MAIN
+###########################################################################
+
+async def main(args) -> dict:
+    import src.config
+    src.config.llm = FakeLLM(args.llm_latency)
+    FakeWarehouse.latency, FakeWarehouse.rows = args.warehouse_latency, args.rows
+    import src.database.bq_client
+    src.database.bq_client.BigQueryRunner = FakeWarehouse
+
+    # Only now build the graph, so every node module picks up the stand-ins
+    from langgraph.checkpoint.memory import MemorySaver
+    from src.graph import workflow
+    import src.console
+    src.console.console.quiet = not args.verbose
+
+    graph = workflow.compile(checkpointer=MemorySaver())
+    if args.executor_workers:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=args.executor_workers))
+
+    questions = load_questions()
+    slots = asyncio.Semaphore(args.concurrency or args.sessions)
+    turns: list = []
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_session(graph, session, script(session, args.turns, questions), slots, turns)
+        for session in range(args.sessions)
+    ))
+    return summarize(turns, time.perf_counter() - start, rss_before, graph)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent load test of the agent graph with fake LLM/warehouse.")
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent manager sessions")
+    parser.add_argument("--turns", type=int, default=3, help="turns per session (question + follow-ups)")
+    parser.add_argument("--concurrency", type=int, default=0, help="sessions running at once (default: all)")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="mean seconds per LLM call")
+    parser.add_argument("--warehouse-latency", type=float, default=0.5, help="mean seconds per warehouse query")
+    parser.add_argument("--rows", type=int, default=12, help="rows returned by queries without LIMIT")
+    parser.add_argument("--executor-workers", type=int, default=0,
+                        help="size of the thread pool sync nodes run on (default: asyncio's min(32, cpus + 4))")
+    parser.add_argument("--verbose", action="store_true", help="show the agent's step output")
+    args = parser.parse_args()
+
+    summary = asyncio.run(main(args))
+    print(json.dumps(summary, indent=2))
+    print(f"Runtime data: {DATA_DIR}")
@@ -3,12 +3,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from rich.console import Console
-from typing import Any
-from langchain_core.messages import HumanMessage
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.types import Command
 
 from src.graph import workflow
+from src.state import new_turn
 from src.console import print_report
 
 console = Console()
@@ -34,24 +33,22 @@ def main():
             console.print("[dim]Goodbye![/dim]")
             break
 
-        payload: dict[str, Any] = {
-            "user_question": question,
-            "messages": [HumanMessage(content=question)],
-            "rows": [],
-            "retry_count": 0,
-            "error_message": "",
-            "generated_sql": "",
-        }
-        result = graph.invoke(payload, config=thread_config)
+        result = graph.invoke(new_turn(question), config=thread_config)
 
         ################### Handle interrupt loop (human-in-the-loop) ###################
+        shown = False
         while result.get("__interrupt__"):
+            # Feedback interrupts come after the report is written - show it before asking
+            if result.get("final_report") and not shown:
+                print_report(result["final_report"])
+                shown = True
             confirmation_msg = result["__interrupt__"][0].value
             console.print(f"\n[bold yellow]{confirmation_msg}[/bold yellow]")
             answer = console.input("[bold]Confirm:[/bold] ").strip()
             result = graph.invoke(Command(resume=answer), config=thread_config)
 
-        print_report(result["final_report"])
+        if not shown:
+            print_report(result["final_report"])
 
 
 if __name__ == "__main__":
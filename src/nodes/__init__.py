@@ -1,7 +1,11 @@
+from src.nodes.report_cache import report_cache
 from src.nodes.router import router
 from src.nodes.golden_knowledge import golden_knowledge
+from src.nodes.schema_linker import schema_linker
 from src.nodes.sql_generator import sql_generator
+from src.nodes.query_planner import query_planner, sub_query
 from src.nodes.sql_executor import sql_executor
 from src.nodes.report_writer import report_writer
+from src.nodes.golden_ingest import golden_ingest
 from src.nodes.general_response import general_response
 from src.nodes.delete_reports import delete_reports
@@ -1,6 +1,8 @@
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from src.state import AgentState
-from src.config import llm
+from src.database.llm_cache import llm_for
+
+llm = llm_for("general_response")
 
 
 def general_response(state: AgentState) -> dict:
@@ -0,0 +1,24 @@
+from langgraph.types import interrupt
+
+from src.state import AgentState
+from src.config import GOLDEN_REQUIRE_FEEDBACK
+from src.golden_knowledge.golden_index import golden_index
+from src.console import print_step
+
+
+def golden_ingest(state: AgentState) -> dict:
+    """Learning loop: propose a clean question -> SQL -> report run as a new golden example."""
+    # Only first-try single-query successes with data are worth learning from
+    if state.get("intent") != "data_query" or state.get("error_message") or state.get("retry_count", 0) or not state.get("row_count"):
+        return {}
+
+    if GOLDEN_REQUIRE_FEEDBACK:
+        answer = interrupt("Was this report useful? Save it as a golden example? (yes/no)")
+        if answer.lower() != "yes":
+            return {}
+
+    if golden_index.ingest(state["user_question"], state["generated_sql"], state["final_report"]):
+        print_step("Golden Knowledge", "Saved this run as a new golden example")
+    else:
+        print_step("Golden Knowledge", "[dim]Near-duplicate of an existing example, not saved[/dim]")
+    return {}
@@ -1,11 +1,10 @@
-import json
-from src.config import SRC
+from src.config import GOLDEN_TOP_K
 from src.state import AgentState
+from src.golden_knowledge.golden_index import golden_index
 
 
 def golden_knowledge(state: AgentState) -> dict:
-    """Load golden knowledge examples into state for SQL generation."""
-    with open(SRC / "golden_knowledge" / "golden_knowledge.json", "r", encoding="utf-8") as f:
-        examples = json.load(f)
+    """Retrieve the most similar golden knowledge examples into state for SQL generation."""
+    examples = golden_index.search(state["user_question"], GOLDEN_TOP_K)
     formatted = [f"Q: {ex['question']}\nSQL: {ex['sql']}\nReport: {ex['report']}" for ex in examples]
     return {"golden_examples": "\n\n".join(formatted)}
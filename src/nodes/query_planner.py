@@ -0,0 +1,67 @@
+from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel
+
+from src.state import AgentState
+from src.config import MAX_RETRIES, MAX_SUB_QUERIES
+from src.database.llm_cache import llm_for
+from src.database.report_store import result_fingerprint
+from src.database.result_store import result_store
+from src.database.schema_index import schema_index
+from src.nodes.sql_generator import generate_sql
+from src.nodes.sql_executor import run_query, pii_redactor, PII_VALUES
+from src.console import print_step, print_sql, print_error
+
+llm = llm_for("query_planner")
+
+
+class QueryPlan(BaseModel):
+    sub_questions: list[str]
+
+
+def query_planner(state: AgentState) -> dict:
+    """Split an analytical 'why' question into independent sub-questions for parallel SQL."""
+    structured_llm = llm.with_structured_output(QueryPlan)
+
+    plan = structured_llm.invoke([
+        SystemMessage(content=(
+            "You plan data analysis for a retail ecommerce database "
+            "(orders, order_items, products, users).\n"
+            f"Split the manager's question into 2-{MAX_SUB_QUERIES} independent sub-questions, "
+            "each answerable by ONE SQL query on its own (e.g. revenue trend, category mix, "
+            "return rate, traffic source). Do not make sub-questions depend on each other."
+        )),
+        HumanMessage(content=state["user_question"]),
+    ])
+
+    sub_questions = plan.sub_questions[:MAX_SUB_QUERIES] or [state["user_question"]]
+    print_step("Planner", f"{len(sub_questions)} sub-queries: {sub_questions}")
+    return {"sub_questions": sub_questions, "sub_results": None}
+
+
+def sub_query(task: dict, config: RunnableConfig) -> dict:
+    """Fan-out worker: generate + execute one sub-question with its own retry loop."""
+    error, sql = "", ""
+    schema = schema_index.link(task["question"])
+    for attempt in range(MAX_RETRIES):
+        try:
+            sql = generate_sql(task["question"], task["history"], schema, task["golden_examples"], error)
+            print_sql(sql, label=f"Sub-query {task['index'] + 1}")
+            df = run_query(sql)
+            if df.empty:
+                raise ValueError("Query returned 0 rows, try a broader query.")
+            masked = df.attrs.pop(PII_VALUES, set())
+            handle = result_store.put(df, config["configurable"].get("thread_id", "default"))
+            pii_redactor.remember(handle, masked)
+            return {"sub_results": [{
+                "index": task["index"], "question": task["question"], "sql": sql, "error": "",
+                "result_handle": handle, "fingerprint": result_fingerprint(df),
+            }]}
+        except Exception as e:
+            error = str(e)
+            print_error(f"Sub-query {task['index'] + 1} retry {attempt + 1}/{MAX_RETRIES}: {error}")
+
+    return {"sub_results": [{
+        "index": task["index"], "question": task["question"], "sql": sql, "error": error,
+        "result_handle": "", "fingerprint": "",
+    }]}
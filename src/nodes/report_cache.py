@@ -0,0 +1,22 @@
+from langchain_core.messages import AIMessage
+
+from src.state import AgentState
+from src.config import REPORT_FRESHNESS_HOURS, persona_version
+from src.database.report_store import report_store, question_key
+from src.console import print_step
+
+
+def report_cache(state: AgentState) -> dict:
+    """Serve a repeated question from the saved report library, skipping the whole pipeline."""
+    version = persona_version()
+    purged = report_store.invalidate_persona(version)
+    if purged:
+        print_step("Report Cache", f"Persona changed, dropped {purged} saved report(s)")
+
+    key = question_key(state["messages"], state["user_question"])
+    report = report_store.find_by_question(key, version, REPORT_FRESHNESS_HOURS)
+    if report is None:
+        return {"cache_hit": False}
+
+    print_step("Report Cache", "[green]Reusing saved report[/green]")
+    return {"cache_hit": True, "final_report": report, "messages": [AIMessage(content=report)]}
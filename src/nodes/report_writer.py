@@ -1,19 +1,66 @@
 import json
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from src.state import AgentState
-from src.config import llm, load_persona
+from src.config import load_persona, persona_version
+from src.database.llm_cache import llm_for
+from src.database.report_store import report_store, question_key
+from src.database.result_store import result_store
+from src.nodes.sql_executor import pii_redactor
+from src.report_templates import render_fast_report
+from src.console import print_step
+
+llm = llm_for("report_writer")
 
 
 def report_writer(state: AgentState) -> dict:
     """Format query rows into an executive report."""
     persona = load_persona()
 
+    if state.get("intent") == "analysis":
+        # Merge the planner's parallel sub-query results, in plan order
+        results = sorted((r for r in state.get("sub_results", []) if not r["error"]), key=lambda r: r["index"])
+        error = "" if results else "; ".join(r["error"] for r in state.get("sub_results", []))
+        handles = [r["result_handle"] for r in results]
+        sql = ";\n".join(r["sql"] for r in results)
+        fingerprint = "-".join(r["fingerprint"] for r in results)
+        data = "\n\n".join(
+            f"Sub-question: {r['question']}\n"
+            f"Query results (JSON):\n{json.dumps(result_store.rows(r['result_handle']), default=str)}"
+            for r in results
+        )
+    else:
+        error = state.get("error_message", "")
+        handles = [state.get("result_handle", "")]
+        sql, fingerprint = state["generated_sql"], state.get("result_fingerprint", "")
+        df = result_store.load(state["result_handle"]) if state.get("result_handle") else None
+        data = f"Query results (JSON):\n{json.dumps(df.to_dict(orient='records') if df is not None else [], default=str)}"
+
     # If all retries failed, tell the user
-    if state.get("error_message"):
-        content = f"I couldn't retrieve the data. Try rephrasing your question.\nError: {state['error_message']}"
+    if error:
+        content = f"I couldn't retrieve the data. Try rephrasing your question.\nError: {error}"
         return {"final_report": content, "messages": [AIMessage(content=content)]}
 
-    # Ask LLM to write executive report from the query results
+    # Same SQL over the same result set already has a report - reuse it
+    version = persona_version()
+    report_store.invalidate_changed_data(sql, fingerprint)
+    content = report_store.find_by_result(sql, fingerprint, version)
+    if content is not None:
+        print_step("Report Cache", "[green]Identical results, reusing saved report[/green]")
+    elif state.get("intent") != "analysis" and (content := render_fast_report(state["user_question"], df, persona)):
+        print_step("Report Writer", "[green]Simple result, rendered from template[/green]")
+    else:
+        content = write_report(state["user_question"], data, persona)
+
+    # Last PII layer: names/emails/addresses the model wrote out anyway, one linear scan
+    content = pii_redactor.for_turn(handles).redact(content)
+
+    report_store.save(state["user_question"], question_key(state["messages"], state["user_question"]),
+                      sql, fingerprint, version, content)
+    return {"final_report": content, "messages": [AIMessage(content=content)]}
+
+
+def write_report(question: str, data: str, persona: dict) -> str:
+    """Ask LLM to write executive report from the query results."""
     resp = llm.invoke([
         SystemMessage(content=(
             f"You are a data analyst writing reports for retail executives.\n"
@@ -23,9 +70,9 @@ def report_writer(state: AgentState) -> dict:
             f"Start with: {persona['greeting']}"
         )),
         HumanMessage(content=(
-            f"Question: {state['user_question']}\n\n"
-            f"Query results (JSON):\n{json.dumps(state['rows'], default=str)}\n\n"
+            f"Question: {question}\n\n"
+            f"{data}\n\n"
             f"Write a concise executive report answering the question from this data."
         )),
     ])
-    return {"final_report": resp.content, "messages": [AIMessage(content=resp.content)]}
+    return resp.content
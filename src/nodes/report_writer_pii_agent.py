@@ -8,6 +8,8 @@ PII strategy:
 - Emails: PIIMiddleware with "redact" catches email patterns in AI output
 - Names: LLM system prompt instructs to never include names (names are too
   diverse for regex - cultural variations, compound names, non-Latin chars)
+- Known names/emails/addresses: pii_redactor matches the final text against the
+  users PII dimension and this turn's masked values (Aho-Corasick, one pass)
 """
 import json
 from langchain.agents import create_agent
@@ -16,7 +18,10 @@ from langchain_core.messages import AIMessage
 from langgraph.checkpoint.memory import InMemorySaver
 
 from src.state import AgentState
-from src.config import llm, load_persona
+from src.config import load_persona
+from src.database.llm_cache import llm_for
+from src.database.result_store import result_store
+from src.nodes.sql_executor import pii_redactor
 
 
 ###########################################################################
@@ -24,7 +29,7 @@ from src.config import llm, load_persona
 ###########################################################################
 
 report_agent = create_agent(
-    model=llm,
+    model=llm_for("report_writer_pii_agent"),
     tools=[],
     system_prompt=(
         "You are a data analyst writing reports for retail executives. "
@@ -59,11 +64,11 @@ def report_writer_pii_agent(state: AgentState) -> dict:
             f"Style: {persona['report_style']}\n"
             f"Start with: {persona['greeting']}\n\n"
             f"Question: {state['user_question']}\n\n"
-            f"Query results (JSON):\n{json.dumps(state['rows'], default=str)}\n\n"
+            f"Query results (JSON):\n{json.dumps(result_store.rows(state['result_handle']), default=str)}\n\n"
             f"Write a concise executive report answering the question from this data. Only include the report in your response. If the data doesn't answer the question, say so and don't make up an answer."
         )}]},
         config,
     )
 
-    content = result["messages"][-1].content
+    content = pii_redactor.for_turn([state["result_handle"]]).redact(result["messages"][-1].content)
     return {"final_report": content, "messages": [AIMessage(content=content)]}
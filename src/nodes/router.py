@@ -3,16 +3,18 @@ from langchain_core.messages import SystemMessage, HumanMessage
 from pydantic import BaseModel
 
 from src.state import AgentState
-from src.config import llm
+from src.database.llm_cache import llm_for
 from src.console import print_step
 
+llm = llm_for("router")
+
 
 class RouteIntent(BaseModel):
-    intent: Literal["data_query", "general", "delete"]
+    intent: Literal["data_query", "analysis", "general", "delete"]
 
 
 def router(state: AgentState) -> dict:
-    """Classify intent as data_query, general, or delete."""
+    """Classify intent as data_query, analysis, general, or delete."""
     structured_llm = llm.with_structured_output(RouteIntent)
 
     result = structured_llm.invoke([
@@ -21,6 +23,8 @@ def router(state: AgentState) -> dict:
             "The system has access to: orders, order_items, products, and users tables "
             "(sales, revenue, customers, countries, categories, brands, time-based metrics).\n"
             "Any question about data, numbers, sales, customers, products, trends, or analysis = data_query.\n"
+            "Open-ended diagnostic questions that need several angles to answer "
+            "(e.g. 'Why is X underperforming?', 'What is driving the drop in Y?') = analysis.\n"
             "Any request to delete, remove, or destroy reports/data = delete.\n"
             "Only greetings, small talk, or 'what can you do' type questions = general."
         )),
@@ -0,0 +1,14 @@
+from src.state import AgentState
+from src.database.schema_index import schema_index
+from src.console import print_step
+
+
+def schema_linker(state: AgentState) -> dict:
+    """Select only the tables/columns (plus join keys) the question needs for the SQL prompt."""
+    # Include the previous user turn so follow-ups ("break that down by month") keep their tables
+    previous = [m.content for m in state["messages"] if m.type == "human"][:-1][-1:]
+    question = " ".join(previous + [state["user_question"]])
+
+    tables = schema_index.select_tables(question)
+    print_step("Schema Linking", f"Tables: {sorted(tables)}")
+    return {"schema_context": schema_index.link(question)}
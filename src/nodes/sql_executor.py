@@ -1,14 +1,32 @@
 import warnings
 warnings.filterwarnings("ignore", message="BigQuery Storage module not found")
 
+import threading
+import contextvars
+from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+import pandas as pd
 import sqlglot
 from sqlglot import exp
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
 
 from src.state import AgentState
-from src.config import PII_COLUMNS, MAX_RETRIES
+from src.config import PII_COLUMNS, MAX_RETRIES, APPROX_SAMPLE_PERCENT
 from src.database.bq_client import BigQueryRunner
+from src.database.report_store import result_fingerprint
+from src.database.result_store import result_store
+from src.database.pii_scanner import PiiScanner
+from src.database.pii_redactor import PiiRedactor
+from src.database.incremental import IncrementalCache
+from src.database.approximate import approximation_allowed, approximate_sql, bounded_columns, error_bound
 
 bq = BigQueryRunner()
+pii_scanner = PiiScanner(bq)
+pii_redactor = PiiRedactor(pii_scanner)
+incremental = IncrementalCache(bq)
+preview_pool = ThreadPoolExecutor(max_workers=4)
 from src.console import print_step, print_error
 
 
@@ -33,35 +51,146 @@ def validate_sql(sql: str) -> dict:
     return {"valid": True, "error": ""}
 
 
-######## SQL Executor Node: Executes SQL and returns sanitized rows ########
-def sql_executor(state: AgentState) -> dict:
-    """Execute SQL and return sanitized rows."""
-    retry_count = state.get("retry_count", 0)
+######## Validate, execute and PII-filter a single query ########
+def run_query(sql: str) -> pd.DataFrame:
+    """Validate and execute SQL, returning a sanitized DataFrame. Raises on any failure."""
+    validation = validate_sql(sql)
+    if not validation["valid"]:
+        raise ValueError(validation["error"])
+    return execute(sql)
+
+
+def execute(sql: str, cancel: Optional[threading.Event] = None) -> pd.DataFrame:
+    """Execute already validated SQL; time-bucketed aggregates only re-query the open/new buckets."""
+    return sanitize(incremental.execute(sql, cancel))
+
+
+PII_VALUES = "pii_values"    # df.attrs key: values removed by sanitize(), for the output redactor
+
+
+def sanitize(df: pd.DataFrame) -> pd.DataFrame:
+    """PII layers applied to every result that leaves the warehouse."""
+    matched = set()
+
+    ###### Second Layer of PII filter #######
+    dropped = [c for c in df.columns if c.lower() in PII_COLUMNS]
+    if dropped:
+        for col in dropped:
+            matched.update(df[col].dropna().astype(str))
+        df = df.drop(columns=dropped)
+        print_step("PII Filter", f"[yellow]Removed columns:[/yellow] {dropped}")
+
+    ###### Third layer: value-level scan (aliases, CONCATs, PII inside free text) #######
+    df, found = pii_scanner.scan(df, matched)
+    if found:
+        print_step("PII Scan", f"[yellow]Masked values:[/yellow] {found}")
+
+    df.attrs[PII_VALUES] = matched
+    return df
+
+
+######## Race parallel SQL candidates, first non-empty result wins ########
+def check_candidate(sql: str) -> str:
+    """Validate and dry-run one candidate (nothing is scanned); returns the error or ''."""
+    validation = validate_sql(sql)
+    if not validation["valid"]:
+        return validation["error"]
     try:
-        validation = validate_sql(state.get("generated_sql", ""))
-        if not validation["valid"]:
-            raise ValueError(validation["error"])
+        bq.dry_run(sql)
+    except Exception as e:
+        return str(e)
+    return ""
+
 
-        df = bq.execute_query(state.get("generated_sql", ""))
+def race_candidates(candidates: list) -> tuple[str, pd.DataFrame]:
+    """Dry-run all candidates in parallel, then execute the valid ones and return the first with rows.
+
+    Once there is a winner the other candidates' BigQuery jobs are cancelled, so losers
+    stop scanning instead of running to completion in the background.
+    """
+    errors = []
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=len(candidates))
+    try:
+        checks = list(pool.map(check_candidate, candidates))
+        errors += [f"Candidate {i + 1}: {error}" for i, error in enumerate(checks) if error]
+        futures = {pool.submit(execute, sql, stop): i for i, sql in enumerate(candidates) if not checks[i]}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                df = future.result()
+            except Exception as e:
+                errors.append(f"Candidate {i + 1}: {e}")
+                continue
+            if df.empty:
+                errors.append(f"Candidate {i + 1}: query returned 0 rows")
+                continue
+            print_step("SQL Executor", f"[green]Candidate {i + 1} won[/green] ({len(futures)} of {len(candidates)} passed the dry run)")
+            return candidates[i], df
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+    raise ValueError("All SQL candidates failed: " + " | ".join(errors))
+
+
+######## Approximate preview while the exact query runs ########
+def start_preview(question: str, sql: str, finished: threading.Event) -> Optional[Future]:
+    """Run a sampled version of the query in the background and publish it as a rough
+    first answer - unless the exact result arrives first."""
+    if not approximation_allowed(question):
+        return None
+    approx = approximate_sql(sql)
+    if approx is None or not validate_sql(approx)["valid"]:
+        return None
+    writer = get_stream_writer()
+
+    def preview():
+        # Cancelled as soon as the exact result (or an error) arrives
+        df, bound = error_bound(sanitize(bq.execute_query(approx, finished)))
+        if finished.is_set() or df.empty:
+            return
+        label = f"~{APPROX_SAMPLE_PERCENT}% sample"
+        if bounded := [c for c in bounded_columns(sql) if c in df.columns]:
+            label += f", ±{bound:.0f}% (95%) on {', '.join(bounded)}"
+        print_step("Approximate", f"[yellow]{label}[/yellow], exact result still running\n{df.head(10).to_markdown(index=False)}")
+        writer({"approximate": df.head(50).to_dict(orient="records"), "label": label})
+
+    # Copy the node's context so the stream writer works from the pool thread.
+    # A failed preview is simply never shown - the exact path reports real errors.
+    return preview_pool.submit(contextvars.copy_context().run, preview)
 
 
-        ###### Second Layer of PII filter #######
-        dropped = [c for c in df.columns if c.lower() in PII_COLUMNS]
-        if dropped:
-            df = df.drop(columns=dropped)
-            print_step("PII Filter", f"[yellow]Removed columns:[/yellow] {dropped}")
+######## SQL Executor Node: Executes SQL and returns sanitized rows ########
+def sql_executor(state: AgentState, config: RunnableConfig) -> dict:
+    """Execute SQL and return a handle to the sanitized rows."""
+    retry_count = state.get("retry_count", 0)
+    sql = state.get("generated_sql", "")
+    finished = threading.Event()
+    try:
+        # Only the first attempt gets a rough answer - retries are already slow enough. Racing
+        # candidates get none: the preview would sample a query that may not be the winner
+        if retry_count == 0 and not state.get("sql_candidates"):
+            start_preview(state["user_question"], sql, finished)
 
+        if state.get("sql_candidates"):
+            sql, df = race_candidates(state["sql_candidates"])
+        else:
+            df = run_query(sql)
+        finished.set()
 
-        ###### Convert back to list of dicts to AgentState usable ######
-        rows = df.to_dict(orient="records")
 
         # Empty results count as a retry so sql_generator can adjust the query
-        if not rows:
+        if df.empty:
             print_error(f"Retry {retry_count + 1}/{MAX_RETRIES}: query returned 0 rows")
-            return {"rows": [], "error_message": "Query returned 0 rows, try a broader query.", "retry_count": retry_count + 1}
+            return {"result_handle": "", "row_count": 0, "sql_candidates": [], "error_message": "Query returned 0 rows, try a broader query.", "retry_count": retry_count + 1}
 
-        return {"rows": rows, "error_message": "", "retry_count": retry_count}
+        ###### Spill rows to the result store, only the handle goes into AgentState ######
+        masked = df.attrs.pop(PII_VALUES, set())     # memory only, never spilled with the rows
+        handle = result_store.put(df, config["configurable"].get("thread_id", "default"))
+        pii_redactor.remember(handle, masked)
+        return {"generated_sql": sql, "sql_candidates": [], "result_handle": handle, "row_count": len(df), "result_fingerprint": result_fingerprint(df), "error_message": "", "retry_count": retry_count}
 
     except Exception as e:
+        finished.set()
         print_error(f"Retry {retry_count + 1}/{MAX_RETRIES}: {str(e)}")
-        return {"error_message": str(e), "retry_count": retry_count + 1, "rows": []}
+        return {"error_message": str(e), "retry_count": retry_count + 1, "sql_candidates": [], "result_handle": "", "row_count": 0}
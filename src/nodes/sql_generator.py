@@ -2,12 +2,21 @@ from datetime import datetime
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from src.state import AgentState
-from src.config import llm, load_db_schema
-from src.console import print_sql
+from src.config import SQL_CANDIDATES
+from src.database.llm_cache import llm_for
+from src.database.schema_index import schema_index
+from src.console import print_sql, print_step
 
+llm = llm_for("sql_generator")
 
 
-schema_text = load_db_schema()
+# Nudges that make parallel candidates differ in approach, not just wording
+CANDIDATE_HINTS = [
+    "",
+    "- Prefer CTEs (WITH clauses) to build the answer step by step\n",
+    "- Prefer one flat query with JOINs and conditional aggregation (COUNTIF / CASE WHEN)\n",
+    "- Be conservative with filters so the query does not return 0 rows\n",
+]
 
 
 def sql_generator(state: AgentState) -> dict:
@@ -15,11 +24,34 @@ def sql_generator(state: AgentState) -> dict:
     
     # Build context from recent conversation and any previous error
     history = "\n".join(f"{m.type}: {m.content}" for m in state["messages"][-6:])
-    error_context = f"\nPrevious SQL failed with: {state['error_message']}\nFix the error.\n" if state.get("error_message") else ""
-    examples_text = state.get("golden_examples", "")
+    schema = state.get("schema_context") or schema_index.full_text
+    examples = state.get("golden_examples", "")
 
-    # Ask LLM to generate SQL
-    resp = llm.invoke([
+    # First attempt: race several diverse candidates, retries fall back to the sequential loop
+    if SQL_CANDIDATES > 1 and not state.get("error_message"):
+        responses = llm.batch([
+            sql_prompt(state["user_question"], history, schema, examples, hint=CANDIDATE_HINTS[i % len(CANDIDATE_HINTS)])
+            for i in range(SQL_CANDIDATES)
+        ])
+        candidates = list(dict.fromkeys(clean_sql(r.content) for r in responses))
+        print_step("SQL Generator", f"{len(candidates)} distinct candidate(s)")
+        for i, sql in enumerate(candidates):
+            print_sql(sql, label=f"Candidate {i + 1}")
+        return {"generated_sql": candidates[0], "sql_candidates": candidates, "error_message": ""}
+
+    sql = generate_sql(state["user_question"], history, schema, examples, state.get("error_message", ""))
+    print_sql(sql)
+    return {"generated_sql": sql, "sql_candidates": [], "error_message": ""}
+
+
+def generate_sql(question: str, history: str, schema_text: str, examples_text: str, error: str = "") -> str:
+    """Ask LLM for a single SQL statement (shared by the main loop and planner sub-queries)."""
+    return clean_sql(llm.invoke(sql_prompt(question, history, schema_text, examples_text, error)).content)
+
+
+def sql_prompt(question: str, history: str, schema_text: str, examples_text: str, error: str = "", hint: str = "") -> list:
+    error_context = f"\nPrevious SQL failed with: {error}\nFix the error.\n" if error else ""
+    return [
         SystemMessage(content=(
             "You are a BigQuery SQL expert for a retail ecommerce database.\n"
             "Generate a single SQL query. Return ONLY the SQL, no markdown.\n\n"
@@ -28,16 +60,17 @@ def sql_generator(state: AgentState) -> dict:
             "- NEVER select PII columns: first_name, last_name, email, street_address\n"
             "- No total column on orders - SUM order_items.sale_price instead\n"
             "- When asked for 'most', 'best', 'top' without a number, default to LIMIT 10 for richer context\n"
+            f"{hint}"
             f"- Current date: {datetime.now().strftime('%Y-%m-%d')}\n\n"
             f"CONVERSATION:\n{history}\n\n"
             f"SCHEMA:\n{schema_text}\n\n"
             f"GOLDEN KNOWLEDGE EXAMPLES:\n{examples_text}"
             f"{error_context}"
         )),
-        HumanMessage(content=state["user_question"]),
-    ])
+        HumanMessage(content=question),
+    ]
 
-    # Strip markdown fences if LLM wraps the SQL
-    sql = resp.content.strip().removeprefix("```sql").removeprefix("```").removesuffix("```").strip()
-    print_sql(sql)
-    return {"generated_sql": sql, "error_message": ""}
+
+def clean_sql(text: str) -> str:
+    """Strip markdown fences if LLM wraps the SQL."""
+    return text.strip().removeprefix("```sql").removeprefix("```").removesuffix("```").strip()
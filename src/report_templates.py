@@ -0,0 +1,112 @@
+"""
+Deterministic report templates for simple result shapes (no LLM call).
+
+Shapes: a single value, a single record, a short time series, or a top-N list.
+Anything else - or any question asking for explanation - goes to the LLM report writer.
+Switches live in persona.yaml under `fast_path` so non-developers can tune them.
+"""
+import re
+import numbers
+from typing import Optional
+
+import pandas as pd
+
+MONEY = re.compile(r"revenue|sales|price|spen[dt]|cost|margin|profit|value|amount", re.I)
+PERCENT = re.compile(r"pct|percent|rate|share|ratio", re.I)
+FRACTION = re.compile(r"rate|share|ratio", re.I)      # often 0-1 rather than 0-100
+NOT_ADDITIVE = re.compile(r"avg|average|mean|median|price|rate|ratio|per_|^(min|max)_|_(min|max)$", re.I)   # a sum of these means nothing
+TIME = re.compile(r"^(date|day|week|month|quarter|year|period|time)|_(date|day|week|month|year)$", re.I)
+
+
+###########################################################################
+##                          FORMATTING
+###########################################################################
+
+def _fmt(column: str, value) -> str:
+    if pd.isna(value):
+        return "n/a"
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        if PERCENT.search(column):
+            scale = 100 if FRACTION.search(column) and abs(value) <= 1 else 1
+            return f"{value * scale:,.1f}%"
+        if MONEY.search(column):
+            return f"${value:,.2f}"
+        return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.2f}"
+    return str(value)
+
+
+def _label(column: str) -> str:
+    return column.replace("_", " ").strip().capitalize()
+
+
+def _body(df: pd.DataFrame, style: str) -> str:
+    formatted = pd.DataFrame({_label(c): [_fmt(c, v) for v in df[c]] for c in df.columns})
+    if style == "bullets":
+        first, *rest = formatted.columns
+        return "\n".join(
+            f"- **{row[first]}**" + (": " + ", ".join(f"{c}: {row[c]}" for c in rest) if rest else "")
+            for _, row in formatted.iterrows()
+        )
+    return formatted.to_markdown(index=False)
+
+
+###########################################################################
+##                            SHAPES
+###########################################################################
+
+def _is_time(df: pd.DataFrame, column: str) -> bool:
+    return bool(TIME.search(column)) or pd.api.types.is_datetime64_any_dtype(df[column])
+
+
+def render_fast_report(question: str, df: pd.DataFrame, persona: dict) -> Optional[str]:
+    """Markdown report for simple result shapes, or None when the LLM should write it."""
+    rules = persona.get("fast_path", {})
+    if not rules.get("enabled") or df.empty:
+        return None
+    if any(word in question.lower() for word in rules.get("llm_keywords", [])):
+        return None
+
+    style = rules.get("format", "table")
+    numeric = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+    labels = [c for c in df.columns if c not in numeric]
+    greeting = persona.get("greeting", "")
+
+    # Single value: "How many jeans were sold last year?"
+    if df.shape == (1, 1):
+        column = df.columns[0]
+        return f"{greeting}\n\n**{_label(column)}:** {_fmt(column, df.iat[0, 0])}"
+
+    # Single record: a handful of metrics for one entity
+    if len(df) == 1 and len(df.columns) <= 6:
+        lines = "\n".join(f"- **{_label(c)}:** {_fmt(c, df.iat[0, i])}" for i, c in enumerate(df.columns))
+        return f"{greeting}\n\n{lines}"
+
+    if len(labels) != 1 or not 1 <= len(numeric) <= 3:
+        return None
+    label, metric = labels[0], numeric[0]
+
+    # Short time series: first/last/change plus peak and low
+    if _is_time(df, label) and len(df) <= rules.get("max_series_points", 24):
+        series = df.sort_values(label, ignore_index=True)
+        first, last = series[metric].iloc[0], series[metric].iloc[-1]
+        change = f" ({(last - first) / first * 100:+.1f}%)" if first else ""
+        peak, low = series.loc[series[metric].idxmax()], series.loc[series[metric].idxmin()]
+        summary = (
+            f"- **{_label(metric)}** went from {_fmt(metric, first)} ({series[label].iloc[0]}) "
+            f"to {_fmt(metric, last)} ({series[label].iloc[-1]}){change}\n"
+            f"- **Peak:** {_fmt(metric, peak[metric])} in {peak[label]}\n"
+            f"- **Low:** {_fmt(metric, low[metric])} in {low[label]}"
+        )
+        return f"{greeting}\n\n{summary}\n\n{_body(series, style)}"
+
+    # Top-N list: the SQL already ranked it, lead with the first row (and its share of the list
+    # for additive metrics like revenue or counts - a share of summed averages is meaningless)
+    if len(df) <= rules.get("max_rows", 10):
+        total = df[metric].sum()
+        leader = df.iloc[0]
+        additive = not PERCENT.search(metric) and not NOT_ADDITIVE.search(metric)
+        share = f" - {leader[metric] / total * 100:.1f}% of the {len(df)} listed" if total and additive else ""
+        summary = f"- **#1:** {leader[label]} with {_fmt(metric, leader[metric])}{share}"
+        return f"{greeting}\n\n{summary}\n\n{_body(df, style)}"
+
+    return None
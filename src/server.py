@@ -0,0 +1,216 @@
+"""
+Async multi-session HTTP server for the agent (alternative to the single-user CLI).
+
+    POST /ask     {"manager_id": "...", "question": "..."}   -> SSE stream
+    POST /resume  {"manager_id": "...", "answer": "yes"}     -> SSE stream (answers an interrupt)
+    DELETE /thread {"manager_id": "..."}                      -> forget the conversation and its results
+    GET  /health
+
+Each manager gets their own LangGraph thread. SSE events: queued, progress (node finished),
+token (report text as it is generated, PII-redacted),
+approximate (rough sampled rows while the exact query runs), interrupt (confirmation needed), report, error.
+A global limit of MAX_CONCURRENT_RUNS turns runs at once; up to MAX_QUEUED_RUNS more wait,
+anything beyond that is shed with 503 + Retry-After.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import json
+import asyncio
+from collections import defaultdict
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+from src.graph import workflow
+from src.state import new_turn
+from src.nodes.sql_executor import pii_redactor
+from src.database.result_store import result_store
+from src.config import MAX_CONCURRENT_RUNS, MAX_QUEUED_RUNS, SERVER_HOST, SERVER_PORT
+
+graph = workflow.compile(checkpointer=MemorySaver())
+
+STREAMED_NODES = {"report_writer", "general_response"}   # nodes whose LLM tokens go to the client
+
+
+###########################################################################
+##                    ADMISSION CONTROL (BACKPRESSURE)
+###########################################################################
+
+class Admission:
+    """Global concurrency limit with a bounded wait queue; beyond the queue, requests are shed."""
+
+    def __init__(self, limit: int, queue_size: int) -> None:
+        self.slots = asyncio.Semaphore(limit)
+        self.queue_size = queue_size
+        self.waiting = 0
+        self.running = 0
+
+    def full(self) -> bool:
+        return self.waiting >= self.queue_size
+
+    def admit(self) -> bool:
+        if self.full():
+            return False
+        self.waiting += 1
+        return True
+
+    def withdraw(self) -> None:
+        """Give up an admitted place in the queue without having run."""
+        self.waiting -= 1
+
+    async def acquire(self) -> None:
+        await self.slots.acquire()
+        self.waiting -= 1
+        self.running += 1
+
+    def release(self) -> None:
+        self.running -= 1
+        self.slots.release()
+
+
+admission = Admission(MAX_CONCURRENT_RUNS, MAX_QUEUED_RUNS)
+thread_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)   # one turn per manager at a time
+
+
+###########################################################################
+##                            STREAMING
+###########################################################################
+
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+BUSY = "Server busy, try again shortly."
+TURN_RUNNING = "A turn is already running for this manager."
+
+
+async def run_turn(graph_input, manager_id: str):
+    """Run one turn on the manager's thread and translate graph stream chunks into SSE events.
+
+    The manager lock and the admission slot are only taken once the client reads the
+    stream, and always given back in `finally` - a client that disconnects before the
+    body starts never holds them.
+    """
+    config = {"configurable": {"thread_id": f"manager-{manager_id}"}}
+    lock = thread_locks[manager_id]
+    locked = admitted = acquired = False
+    handles, streams = [], {}     # result handles seen this turn, PII stream redactor per streaming node
+    model_nodes = set()           # nodes whose chat model already streamed their text
+    try:
+        # start_turn already checked both; this catches a request that raced it
+        if lock.locked() or not admission.admit():
+            yield sse("error", {"message": TURN_RUNNING if lock.locked() else BUSY})
+            return
+        admitted = True
+        await lock.acquire()      # free, checked above on the same event loop
+        locked = True
+        yield sse("queued", {"waiting": admission.waiting, "running": admission.running})
+        await admission.acquire()
+        acquired = True
+
+        async for mode, chunk in graph.astream(graph_input, config, stream_mode=["updates", "messages", "custom"]):
+            if mode == "messages":
+                message, metadata = chunk
+                node = metadata.get("langgraph_node")
+                # `messages` mode also re-sends the AIMessage a node returns; it only carries new
+                # text when no chat model ran (template and cached reports)
+                if "ls_provider" in metadata:
+                    model_nodes.add(node)
+                elif node in model_nodes:
+                    continue
+                if node in STREAMED_NODES and message.content:
+                    if node not in streams:     # compile the turn's automaton once, not per token
+                        streams[node] = pii_redactor.for_turn(handles).stream()
+                    if text := streams[node].feed(message.content):
+                        yield sse("token", {"text": text})
+            elif mode == "custom":
+                yield sse("approximate" if "approximate" in chunk else "progress", chunk)
+            elif "__interrupt__" in chunk:
+                yield sse("interrupt", {"message": chunk["__interrupt__"][0].value})
+                return
+            else:
+                node, update = next(iter(chunk.items()))
+                if node in streams and (tail := streams.pop(node).flush()):
+                    yield sse("token", {"text": tail})
+                update = update or {}
+                handles += [update.get("result_handle", "")] + [r["result_handle"] for r in update.get("sub_results") or []]
+                yield sse("progress", {"node": node})
+
+        state = await graph.aget_state(config)
+        yield sse("report", {"text": state.values.get("final_report", "")})
+    except Exception as e:
+        yield sse("error", {"message": str(e)})
+    finally:
+        if acquired:
+            admission.release()
+        elif admitted:
+            admission.withdraw()
+        if locked:
+            lock.release()
+
+
+async def start_turn(manager_id: str, graph_input) -> JSONResponse | StreamingResponse:
+    if thread_locks[manager_id].locked():
+        return JSONResponse({"error": TURN_RUNNING}, status_code=409)
+    if admission.full():
+        return JSONResponse({"error": BUSY}, status_code=503, headers={"Retry-After": "5"})
+    return StreamingResponse(run_turn(graph_input, manager_id), media_type="text/event-stream")
+
+
+###########################################################################
+##                             ROUTES
+###########################################################################
+
+async def ask(request: Request):
+    body = await request.json()
+    if not body.get("manager_id") or not body.get("question", "").strip():
+        return JSONResponse({"error": "manager_id and question are required."}, status_code=400)
+    return await start_turn(str(body["manager_id"]), new_turn(body["question"].strip()))
+
+
+async def resume(request: Request):
+    """Answer a pending interrupt (e.g. delete_reports confirmation) on the manager's thread."""
+    body = await request.json()
+    manager_id = str(body.get("manager_id", ""))
+    state = await graph.aget_state({"configurable": {"thread_id": f"manager-{manager_id}"}})
+    if not state.interrupts:
+        return JSONResponse({"error": "Nothing is waiting for confirmation."}, status_code=409)
+    return await start_turn(manager_id, Command(resume=str(body.get("answer", ""))))
+
+
+async def delete_thread(request: Request):
+    """End a manager's conversation: drop its checkpoints and spilled query results."""
+    body = await request.json()
+    manager_id = str(body.get("manager_id", ""))
+    if not manager_id:
+        return JSONResponse({"error": "manager_id is required."}, status_code=400)
+    if thread_locks[manager_id].locked():
+        return JSONResponse({"error": TURN_RUNNING}, status_code=409)
+    thread_id = f"manager-{manager_id}"
+    await graph.checkpointer.adelete_thread(thread_id)
+    await asyncio.to_thread(result_store.delete_thread, thread_id)
+    thread_locks.pop(manager_id, None)
+    return JSONResponse({"deleted": manager_id})
+
+
+async def health(request: Request):
+    return JSONResponse({"running": admission.running, "waiting": admission.waiting})
+
+
+app = Starlette(routes=[
+    Route("/ask", ask, methods=["POST"]),
+    Route("/resume", resume, methods=["POST"]),
+    Route("/thread", delete_thread, methods=["DELETE"]),
+    Route("/health", health, methods=["GET"]),
+])
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host=SERVER_HOST, port=SERVER_PORT)
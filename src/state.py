@@ -1,7 +1,13 @@
-from typing import TypedDict, Annotated
+from typing import TypedDict, Annotated, Optional
+from langchain_core.messages import HumanMessage
 from langgraph.graph.message import add_messages
 
 
+def merge_sub_results(left: list, right: Optional[list]) -> list:
+    """Parallel sub-queries append their results; the planner resets with None each turn."""
+    return [] if right is None else (left or []) + right
+
+
 ###########################################################################
 ##                             STATE
 ###########################################################################
@@ -10,16 +16,38 @@ class AgentState(TypedDict):
     ###### Conversation ######
     messages: Annotated[list, add_messages]  # conversation history (auto-appended)
     user_question: str                       # current user input
-    intent: str                              # "data_query" or "general"
+    intent: str                              # "data_query", "analysis", "general" or "delete"
+    cache_hit: bool                          # answered from the saved report library
     
     ###### Knowledge ######
     golden_examples: str                     # few-shot examples from golden knowledge bucket
+    schema_context: str                      # linked schema subset for this question
 
     ###### SQL #######
     generated_sql: str                       # SQL produced by sql_generator
-    rows: list                               # query result rows (list of dicts)
+    sql_candidates: list                     # diverse SQL candidates raced by sql_executor (first attempt)
+    result_handle: str                       # handle to the result set in the result store (rows live off-state)
+    row_count: int                           # number of rows behind result_handle
     error_message: str                       # SQL error for retry loop
     retry_count: int                         # current retry attempt (max 3)
+    result_fingerprint: str                  # content hash of the result set (report reuse)
     
+    ###### Planner (multi-query fan-out) ######
+    sub_questions: list                      # independent sub-questions for an analysis question
+    sub_results: Annotated[list, merge_sub_results]  # one entry per sub-query (sql, result_handle, error)
+
     ###### Report ######
     final_report: str                        # formatted report for the user
+
+
+def new_turn(question: str) -> dict:
+    """Graph input for a new user question - resets the per-turn fields."""
+    return {
+        "user_question": question,
+        "messages": [HumanMessage(content=question)],
+        "result_handle": "",
+        "retry_count": 0,
+        "error_message": "",
+        "generated_sql": "",
+        "final_report": "",
+    }
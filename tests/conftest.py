@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Modules read these at import time - never use real credentials or the local .data dir in tests
+os.environ.setdefault("GOOGLE_API_KEY_PAID", "test")
+os.environ.setdefault("AGENT_DATA_DIR", tempfile.mkdtemp(prefix="agent-test-"))
+os.environ["AGENT_LLM_CACHE"] = "off"
@@ -0,0 +1,60 @@
+import pytest
+import sqlglot
+from sqlglot import exp
+
+from src.database.approximate import approximate_sql, approximation_allowed, bounded_columns
+
+ORDER_ITEMS = "`bigquery-public-data.thelook_ecommerce.order_items`"
+PRODUCTS = "`bigquery-public-data.thelook_ecommerce.products`"
+
+
+def scaled(sql: str) -> list:
+    """SQL of every aggregate multiplied by the sample scale factor."""
+    tree = sqlglot.parse_one(sql, dialect="bigquery")
+    return [m.this.sql(dialect="bigquery") for m in tree.find_all(exp.Mul) if isinstance(m.this, exp.AggFunc)]
+
+
+def test_scalar_subquery_is_not_scaled():
+    sql = approximate_sql(
+        f"SELECT status, COUNT(*) * 100.0 / (SELECT COUNT(*) FROM {ORDER_ITEMS}) AS pct "
+        f"FROM {ORDER_ITEMS} GROUP BY status"
+    )
+    subquery = sqlglot.parse_one(sql, dialect="bigquery").find(exp.Subquery)
+    assert "TABLESAMPLE" not in subquery.sql(dialect="bigquery")
+    assert not subquery.find(exp.Mul)
+    assert scaled(sql) == ["COUNT(*)"]
+
+
+def test_window_share_stays_valid():
+    sql = approximate_sql(
+        f"SELECT p.category, SUM(oi.sale_price) / SUM(SUM(oi.sale_price)) OVER () AS share "
+        f"FROM {ORDER_ITEMS} oi JOIN {PRODUCTS} p ON p.id = oi.product_id GROUP BY p.category"
+    )
+    tree = sqlglot.parse_one(sql, dialect="bigquery")
+    window = tree.find(exp.Window)
+    assert isinstance(window.this, exp.Sum)                 # still SUM(...) OVER (), not (SUM(...) * 10) OVER ()
+    assert scaled(sql) == ["SUM(oi.sale_price)", "SUM(oi.sale_price)"]   # numerator and the window's argument
+
+
+def test_distinct_counts_are_not_approximated():
+    assert approximate_sql(
+        f"SELECT FORMAT_DATE('%Y-%m', DATE(created_at)) AS month, COUNT(DISTINCT user_id) AS buyers "
+        f"FROM {ORDER_ITEMS} GROUP BY month"
+    ) is None
+
+
+def test_error_bound_covers_only_scaled_columns():
+    sql = (f"SELECT status, SUM(sale_price) AS revenue, COUNT(*) AS items, AVG(sale_price) AS avg_price, "
+           f"MAX(sale_price) AS top_price FROM {ORDER_ITEMS} GROUP BY status")
+    assert approximate_sql(sql) is not None
+    assert bounded_columns(sql) == ["revenue", "items"]
+
+
+@pytest.mark.parametrize("question, allowed", [
+    ("What is the revenue trend by month?", True),
+    ("Return rates by category", True),
+    ("How accurate is our separate category data?", False),
+    ("Generate a list of brands", False),
+])
+def test_approximation_keywords_match_whole_words(question, allowed):
+    assert approximation_allowed(question) is allowed
@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import CancelledError, TimeoutError
+
+import pandas as pd
+import pytest
+
+from src.database.bq_client import BigQueryRunner
+
+
+class FakeJob:
+    job_id = "job-1"
+
+    def __init__(self, polls_before_done: int) -> None:
+        self.polls = polls_before_done
+        self.cancelled = False
+
+    def result(self, timeout=None):
+        if timeout is None or self.polls == 0:
+            return self
+        self.polls -= 1
+        raise TimeoutError()
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame({"n": [1]})
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class FakeClient:
+    def __init__(self, job: FakeJob) -> None:
+        self.job = job
+
+    def query(self, sql, job_config=None):
+        return self.job
+
+
+def runner(job: FakeJob) -> BigQueryRunner:
+    bq = BigQueryRunner.__new__(BigQueryRunner)
+    bq.client = FakeClient(job)
+    return bq
+
+
+def test_cancel_event_cancels_the_running_job():
+    job, cancel = FakeJob(polls_before_done=1000), threading.Event()
+    cancel.set()
+    with pytest.raises(CancelledError):
+        runner(job).execute_query("SELECT 1", cancel)
+    assert job.cancelled
+
+
+def test_unset_cancel_event_waits_for_the_result():
+    job = FakeJob(polls_before_done=3)
+    assert runner(job).execute_query("SELECT 1", threading.Event())["n"].tolist() == [1]
+    assert not job.cancelled
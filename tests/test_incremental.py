@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from src.database.incremental import IncrementalCache, plan_incremental
+
+TABLE = "`bigquery-public-data.thelook_ecommerce.orders`"
+
+
+def bucket_query(fmt: str) -> str:
+    return f"SELECT FORMAT_TIMESTAMP('{fmt}', created_at) AS bucket, COUNT(*) AS orders FROM {TABLE} GROUP BY bucket"
+
+
+@pytest.mark.parametrize("fmt", ["%m", "%d", "%H", "%Y-%W"])
+def test_buckets_spanning_years_are_not_incremental(fmt):
+    assert plan_incremental(bucket_query(fmt)) is None
+
+
+@pytest.mark.parametrize("fmt, grain", [("%Y", "year"), ("%Y-%m", "month"), ("%Y-%m-%d", "day")])
+def test_calendar_buckets_are_incremental(fmt, grain):
+    assert plan_incremental(bucket_query(fmt)).grain == grain
+
+
+class FakeRunner:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self.queries = []
+
+    def execute_query(self, sql: str, cancel=None) -> pd.DataFrame:
+        self.queries.append(sql)
+        return self.df.copy()
+
+
+def test_month_of_year_is_always_queried_in_full():
+    runner = FakeRunner(pd.DataFrame({"bucket": [f"{m:02d}" for m in range(1, 13)], "orders": range(12)}))
+    cache = IncrementalCache(runner)
+    sql = bucket_query("%m")
+    cache.execute(sql)
+    assert len(cache.execute(sql)) == 12
+    assert runner.queries == [sql, sql]
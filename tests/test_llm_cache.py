@@ -0,0 +1,45 @@
+import sqlite3
+import time
+
+import pytest
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration
+
+from src.database.llm_cache import LLMCache, ReplayMiss
+
+
+def prompt(day: str) -> str:
+    return dumps([SystemMessage(content=f"- Current date: {day}\n"), HumanMessage(content="top brands?")])
+
+
+def answer(text: str) -> list:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def test_recordings_survive_cache_mode_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.database.llm_cache.DATA_DIR", tmp_path)
+    LLMCache("record").update(prompt("2026-01-01"), "model", answer("recorded"))
+    with sqlite3.connect(tmp_path / "llm_recordings.sqlite") as conn:
+        conn.execute("UPDATE responses SET created_at = ?, used_at = ?", (time.time() - 2 * 86400,) * 2)
+
+    cache = LLMCache("cache", ttl_hours=24, size=1)
+    assert cache.lookup(prompt("2026-01-01"), "model") is None
+    cache.update(prompt("2026-01-02"), "model", answer("cached"))
+
+    assert LLMCache("replay").lookup(prompt("2026-01-01"), "model")[0].message.content == "recorded"
+
+
+def test_replay_ignores_the_prompt_date(tmp_path):
+    path = tmp_path / "recordings.sqlite"
+    LLMCache("record", path=path).update(prompt("2026-01-01"), "model", answer("SELECT 1"))
+    replay = LLMCache("replay", path=path)
+    assert replay.lookup(prompt("2026-03-15"), "model")[0].message.content == "SELECT 1"
+    with pytest.raises(ReplayMiss):
+        replay.lookup(prompt("2026-03-15"), "other-model")
+
+
+def test_cache_mode_keys_on_the_date(tmp_path):
+    cache = LLMCache("cache", path=tmp_path / "cache.sqlite")
+    cache.update(prompt("2026-01-01"), "model", answer("SELECT 1"))
+    assert cache.lookup(prompt("2026-01-02"), "model") is None
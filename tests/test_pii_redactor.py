@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from src.database.pii_redactor import PiiRedactor, Redaction, build_automaton
+from src.database.pii_scanner import REDACTED
+
+
+class FakeScanner:
+    def __init__(self, dimension: set) -> None:
+        self.dimension = dimension
+
+
+def test_dimension_is_rebuilt_once_the_scanner_loads_it():
+    scanner = FakeScanner(set())
+    redactor = PiiRedactor(scanner)
+    assert redactor.for_turn([]).redact("Top buyer was Jane Doe") == "Top buyer was Jane Doe"
+
+    scanner.dimension = {"jane doe"}
+    assert redactor.for_turn([]).redact("Top buyer was Jane Doe") == f"Top buyer was {REDACTED}"
+
+
+def test_turn_values_are_redacted():
+    redactor = PiiRedactor(FakeScanner(set()))
+    redactor.remember("t/1", ["bob@corp.io"])
+    assert redactor.for_turn(["t/1"]).redact("Contact bob@corp.io today") == f"Contact {REDACTED} today"
+
+
+def stream(redaction: Redaction, chunks: list) -> str:
+    redactor = redaction.stream()
+    return "".join(redactor.feed(chunk) for chunk in chunks) + redactor.flush()
+
+
+@pytest.mark.parametrize("values, chunks", [
+    ({"doe jane", "jane@example.com"}, ["sale", "sDoe j", "ane@", "examp", "le.", "c", "om s", "a", "les"]),
+    ({"jane", "12 elm", "elm st"}, ["janet1", "2", " elm ", "st and jane"]),
+])
+def test_stream_matches_one_shot_redaction(values, chunks):
+    redaction = Redaction([build_automaton(values)])
+    assert stream(redaction, chunks) == redaction.redact("".join(chunks))
+
+
+def test_stream_matches_one_shot_redaction_for_random_chunkings():
+    rng = random.Random(0)
+    words = ["doe", "Jane", "jane@example.com", "salesDoe", "janet", "12", "elm", "st", "x", "."]
+    redaction = Redaction([build_automaton({"doe jane", "jane doe", "jane@example.com", "12 elm", "elm st"})])
+    for _ in range(2000):
+        text = "".join(rng.choice(words) + rng.choice(["", " ", ","]) for _ in range(rng.randint(1, 10)))
+        cuts = sorted(rng.sample(range(1, len(text)), min(len(text) - 1, rng.randint(0, 6))))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        assert stream(redaction, chunks) == redaction.redact(text), chunks
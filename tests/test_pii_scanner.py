@@ -0,0 +1,51 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from src.database.pii_scanner import PII_PATTERN, REDACTED, PiiScanner
+
+
+class FakeRunner:
+    def execute_query(self, sql: str) -> pd.DataFrame:
+        return pd.DataFrame({"v": ["jane doe", "jane@example.com", "12 elm st"]})
+
+
+def test_pattern_compiles_with_python_re():
+    re.compile(PII_PATTERN)
+
+
+@pytest.mark.parametrize("product", [
+    "Adidas Originals 3 Stripe Court Sneaker",
+    "Carhartt 2 Way Zip Hoodie",
+    "Levi's 501 Original Fit Jeans",
+])
+def test_product_names_are_not_addresses(product):
+    df = pd.DataFrame({"product": [product, "Plain Tee"]})
+    sanitized, found = PiiScanner(FakeRunner()).scan(df)
+    assert not found
+    assert sanitized["product"].tolist() == [product, "Plain Tee"]
+
+
+def test_addresses_emails_and_dimension_values_are_masked():
+    df = pd.DataFrame({"note": ["ship to 835 Brewer Avenue", "mail bob@corp.io", "Jane Doe", "12 Elm St"] + ["ok"] * 6})
+    matched = set()
+    sanitized, found = PiiScanner(FakeRunner()).scan(df, matched)
+    assert found == {"note": 4}
+    assert sanitized["note"].tolist() == [REDACTED] * 4 + ["ok"] * 6
+    assert "Jane Doe" in matched and "12 Elm St" in matched
+
+
+def test_concurrent_first_scans_wait_for_the_dimension():
+    class SlowRunner(FakeRunner):
+        def execute_query(self, sql: str) -> pd.DataFrame:
+            time.sleep(0.2)
+            return super().execute_query(sql)
+
+    scanner = PiiScanner(SlowRunner())
+    df = pd.DataFrame({"buyer": ["Jane Doe"] + ["ok"] * 3})
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(lambda _: scanner.scan(df)[1], range(3)))
+    assert results == [{"buyer": 1}] * 3
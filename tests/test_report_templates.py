@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+
+from src.report_templates import render_fast_report
+
+PERSONA = {"greeting": "Hi", "fast_path": {"enabled": True, "format": "table"}}
+
+
+@pytest.mark.parametrize("metric", ["avg_order_value", "average_price", "retail_price", "mean_basket"])
+def test_top_list_of_non_additive_metric_has_no_share(metric):
+    df = pd.DataFrame({"country": ["China", "United States", "Brasil"], metric: [86.10, 85.70, 85.20]})
+    report = render_fast_report("What is the average order value by country?", df, PERSONA)
+    assert "**#1:** China with" in report
+    assert "listed" not in report
+
+
+def test_top_list_of_revenue_shows_share():
+    df = pd.DataFrame({"brand": ["Levi's", "Nike", "Adidas"], "revenue": [500.0, 300.0, 200.0]})
+    report = render_fast_report("Top brands by revenue", df, PERSONA)
+    assert "**#1:** Levi's with $500.00 - 50.0% of the 3 listed" in report